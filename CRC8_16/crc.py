@@ -1,5 +1,21 @@
+import csv
+import json
+import math
+import mmap
+import os
+import platform
+import statistics
+import struct
+import sys
 import time
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для векторизованных вычислений
+    np = None
 
 
 # CRC-8
@@ -42,10 +58,10 @@ def crc8_generate_table(polynomial: int = 0x07) -> List[int]:
 
 
 def crc8_table(data: bytes, polynomial: int = 0x07, 
-               init: int = 0x00, table: List[int] = None) -> int:
+               init: int = 0x00, table: Sequence[int] = None) -> int:
     """Вычисление CRC-8 через таблицу lookup"""
     if table is None:
-        table = crc8_generate_table(polynomial)
+        table = crc_table(8, polynomial)
 
     crc = init
 
@@ -56,6 +72,45 @@ def crc8_table(data: bytes, polynomial: int = 0x07,
     return crc
 
 
+def crc8_generate_slicing_tables(polynomial: int = 0x07,
+                                 slices: int = 8) -> List[List[int]]:
+    """Таблицы slicing-by-N для CRC-8: tables[k][x] - CRC байта x и k нулевых байт"""
+    tables = [crc8_generate_table(polynomial)]
+
+    for _ in range(1, slices):
+        prev = tables[-1]
+        tables.append([tables[0][value] for value in prev])
+
+    return tables
+
+
+def crc8_sliced(data: bytes, polynomial: int = 0x07, init: int = 0x00,
+                tables: Sequence[Sequence[int]] = None, slices: int = 8) -> int:
+    """Вычисление CRC-8 методом slicing-by-4/8 (несколько байт за шаг)"""
+    if tables is None:
+        tables = _cached_slicing_tables(8, polynomial, slices)
+    slices = len(tables)
+
+    view = memoryview(data).cast('B')
+    end = len(view) - len(view) % slices
+    crc = init
+
+    if slices == 8:
+        t7, t6, t5, t4, t3, t2, t1, t0 = tables[::-1]
+        for b0, b1, b2, b3, b4, b5, b6, b7 in struct.iter_unpack('8B', view[:end]):
+            crc = (t7[crc ^ b0] ^ t6[b1] ^ t5[b2] ^ t4[b3]
+                   ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+    elif slices == 4:
+        t3, t2, t1, t0 = tables[::-1]
+        for b0, b1, b2, b3 in struct.iter_unpack('4B', view[:end]):
+            crc = t3[crc ^ b0] ^ t2[b1] ^ t1[b2] ^ t0[b3]
+    else:
+        raise ValueError("Поддерживается slicing-by-4 и slicing-by-8")
+
+    # Остаток короче одного шага - обычной таблицей
+    return crc8_table(view[end:], init=crc, table=tables[0])
+
+
 # CRC-16
 def crc16_bitwise(data: bytes, polynomial: int = 0x1021, 
                   init: int = 0xFFFF) -> int:
@@ -97,10 +152,10 @@ def crc16_generate_table(polynomial: int = 0x1021) -> List[int]:
 
 
 def crc16_table(data: bytes, polynomial: int = 0x1021, 
-                init: int = 0xFFFF, table: List[int] = None) -> int:
+                init: int = 0xFFFF, table: Sequence[int] = None) -> int:
     """Вычисление CRC-16 через таблицу lookup"""
     if table is None:
-        table = crc16_generate_table(polynomial)
+        table = crc_table(16, polynomial)
 
     crc = init
 
@@ -111,56 +166,707 @@ def crc16_table(data: bytes, polynomial: int = 0x1021,
     return crc
 
 
-# Тестирование и сравнение
-def compare_methods(data: bytes) -> None:
-    """Сравнение производительности методов"""
-    print("=" * 70)
-    print(f"Тестовые данные: {data[:50]}{'...' if len(data) > 50 else ''}")
-    print(f"Длина данных: {len(data)} байт")
-    print("=" * 70)
+def crc16_generate_slicing_tables(polynomial: int = 0x1021,
+                                  slices: int = 8) -> List[List[int]]:
+    """Таблицы slicing-by-N для CRC-16: tables[k][x] - CRC байта x и k нулевых байт"""
+    tables = [crc16_generate_table(polynomial)]
+    base = tables[0]
+
+    for _ in range(1, slices):
+        prev = tables[-1]
+        tables.append([((value << 8) & 0xFFFF) ^ base[value >> 8] for value in prev])
+
+    return tables
+
 
-    # CRC-8
-    print("\nРезультаты CRC-8:")
-    print("-" * 70)
+def crc16_sliced(data: bytes, polynomial: int = 0x1021, init: int = 0xFFFF,
+                 tables: Sequence[Sequence[int]] = None, slices: int = 8) -> int:
+    """Вычисление CRC-16 методом slicing-by-4/8 (несколько байт за шаг)"""
+    if tables is None:
+        tables = _cached_slicing_tables(16, polynomial, slices)
+    slices = len(tables)
 
-    crc8_lut = crc8_generate_table(0x07)
+    view = memoryview(data).cast('B')
+    end = len(view) - len(view) % slices
+    crc = init
 
-    start = time.perf_counter()
-    crc8_bit = crc8_bitwise(data)
-    time_bit = time.perf_counter() - start
+    # Регистр входит в первые два байта шага, остальные байты - через свои таблицы
+    if slices == 8:
+        t7, t6, t5, t4, t3, t2, t1, t0 = tables[::-1]
+        for b0, b1, b2, b3, b4, b5, b6, b7 in struct.iter_unpack('8B', view[:end]):
+            crc = (t7[(crc >> 8) ^ b0] ^ t6[(crc & 0xFF) ^ b1] ^ t5[b2] ^ t4[b3]
+                   ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+    elif slices == 4:
+        t3, t2, t1, t0 = tables[::-1]
+        for b0, b1, b2, b3 in struct.iter_unpack('4B', view[:end]):
+            crc = t3[(crc >> 8) ^ b0] ^ t2[(crc & 0xFF) ^ b1] ^ t1[b2] ^ t0[b3]
+    else:
+        raise ValueError("Поддерживается slicing-by-4 и slicing-by-8")
+
+    return crc16_table(view[end:], init=crc, table=tables[0])
+
+
+# Векторизованный расчёт (NumPy)
+# Ниже этого размера накладные расходы NumPy больше выигрыша
+_NUMPY_MIN_SIZE = 1 << 16
+
+
+def _crc_rows(rows, lut, width: int, regs):
+    """CRC каждой строки матрицы байт: один шаг - по байту всех строк сразу"""
+    mask = (1 << width) - 1
+    shift = width - 8
+    for j in range(rows.shape[1]):
+        column = rows[:, j]
+        regs = ((regs << 8) & mask) ^ lut[((regs >> shift) ^ column) & 0xFF]
+    return regs
+
+
+def _crc_numpy(data: bytes, table: Sequence[int], width: int, init: int,
+               block_size: int = None) -> int:
+    """Блочный CRC: блоки считаются параллельно, затем склеиваются по линейности CRC"""
+    if np is None:
+        raise RuntimeError("Для векторизованного CRC нужен NumPy")
+
+    view = memoryview(data).cast('B')
+    buf = np.frombuffer(view, dtype=np.uint8)
+    n = len(buf)
+    mask = (1 << width) - 1
+    shift = width - 8
+
+    def step_table(crc: int, chunk) -> int:
+        if width == 8:
+            return crc8_table(chunk, init=crc, table=table)
+        return crc16_table(chunk, init=crc, table=table)
+
+    # Короткие данные при автоматическом размере блока - обычной таблицей
+    if block_size is None:
+        block_size = max(256, math.isqrt(n)) if n >= _NUMPY_MIN_SIZE else n
+    blocks = n // block_size if block_size else 0
+    if blocks < 2:
+        return step_table(init, view)
+
+    lut = np.array(table, dtype=np.uint32)
+    rows = buf[:blocks * block_size].reshape(blocks, block_size)
+
+    # Каждый блок - от нулевого регистра
+    regs = _crc_rows(rows, lut, width, np.zeros(blocks, dtype=np.uint32))
+
+    # Сдвиг регистра через block_size нулевых байт - линейное отображение,
+    # для CRC-16 задаётся таблицами старшего и младшего байта
+    basis = np.arange(256, dtype=np.uint32)
+    zero_regs = np.concatenate([basis << shift, basis]) if width == 16 else basis.copy()
+    for _ in range(block_size):
+        zero_regs = ((zero_regs << 8) & mask) ^ lut[(zero_regs >> shift) & 0xFF]
+    advance = zero_regs.tolist()
 
-    print(f"Побитовый: 0x{crc8_bit:02X} ({crc8_bit:3d}) - Время: {time_bit*1e6:8.2f} µs")
+    crc = init
+    for block_crc in regs.tolist():
+        if width == 16:
+            crc = advance[crc >> 8] ^ advance[256 + (crc & 0xFF)] ^ block_crc
+        else:
+            crc = advance[crc] ^ block_crc
 
-    start = time.perf_counter()
-    crc8_tbl = crc8_table(data, table=crc8_lut)
-    time_tbl = time.perf_counter() - start
+    return step_table(crc, view[blocks * block_size:])
 
-    print(f"Табличный: 0x{crc8_tbl:02X} ({crc8_tbl:3d}) - Время: {time_tbl*1e6:8.2f} µs")
-    print(f"Совпадение: {crc8_bit == crc8_tbl} | Ускорение: {time_bit/time_tbl:.2f}x")
 
-    # CRC-16
-    print("\nРезультаты CRC-16:")
-    print("-" * 70)
+def crc8_numpy(data: bytes, polynomial: int = 0x07, init: int = 0x00,
+               table: Sequence[int] = None, block_size: int = None) -> int:
+    """Вычисление CRC-8 векторизованно (NumPy), для больших буферов"""
+    if table is None:
+        table = crc_table(8, polynomial)
+    return _crc_numpy(data, table, 8, init, block_size)
 
-    crc16_lut = crc16_generate_table(0x1021)
 
-    start = time.perf_counter()
-    crc16_bit = crc16_bitwise(data)
-    time_bit = time.perf_counter() - start
+def crc16_numpy(data: bytes, polynomial: int = 0x1021, init: int = 0xFFFF,
+                table: Sequence[int] = None, block_size: int = None) -> int:
+    """Вычисление CRC-16 векторизованно (NumPy), для больших буферов"""
+    if table is None:
+        table = crc_table(16, polynomial)
+    return _crc_numpy(data, table, 16, init, block_size)
 
-    print(f"Побитовый: 0x{crc16_bit:04X} ({crc16_bit:5d}) - Время: {time_bit*1e6:8.2f} µs")
 
-    start = time.perf_counter()
-    crc16_tbl = crc16_table(data, table=crc16_lut)
-    time_tbl = time.perf_counter() - start
+# Параметризованные модели CRC (Rocksoft)
+def _reflect(value: int, width: int) -> int:
+    """Зеркальное отражение младших width бит"""
+    result = 0
+    for _ in range(width):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+@lru_cache(maxsize=128)
+def crc_table(width: int, polynomial: int, reflected: bool = False) -> Tuple[int, ...]:
+    """Таблица lookup для CRC любой ширины (общий LRU-кэш процесса)"""
+    mask = (1 << width) - 1
+    table = []
+
+    if reflected:
+        # Отражённый алгоритм: регистр сдвигается вправо, полином отражён
+        poly = _reflect(polynomial, width)
+        for dividend in range(256):
+            curr = dividend
+            for _ in range(8):
+                curr = (curr >> 1) ^ poly if curr & 1 else curr >> 1
+            table.append(curr)
+    else:
+        top_bit = 1 << (width - 1)
+        for dividend in range(256):
+            curr = dividend << (width - 8)
+            for _ in range(8):
+                curr = (curr << 1) ^ polynomial if curr & top_bit else curr << 1
+                curr &= mask
+            table.append(curr)
+
+    return tuple(table)
+
+
+@lru_cache(maxsize=32)
+def _cached_slicing_tables(width: int, polynomial: int,
+                           slices: int) -> Tuple[Tuple[int, ...], ...]:
+    """Кэшированные таблицы slicing-by-N для CRC-8/CRC-16"""
+    if width == 8:
+        tables = crc8_generate_slicing_tables(polynomial, slices)
+    else:
+        tables = crc16_generate_slicing_tables(polynomial, slices)
+    return tuple(tuple(table) for table in tables)
+
+
+class CRCModel:
+    """Модель CRC в нотации Rocksoft: width, poly, init, refin, refout, xorout"""
+
+    def __init__(self, name: str, width: int, poly: int, init: int = 0,
+                 refin: bool = False, refout: bool = False, xorout: int = 0,
+                 check: int = None):
+        if width not in (8, 16, 32, 64):
+            raise ValueError(f"Поддерживается ширина 8/16/32/64 бит, получено {width}")
+        self.name = name
+        self.width = width
+        self.mask = (1 << width) - 1
+        self.poly = poly & self.mask
+        self.init = init & self.mask
+        self.refin = refin
+        self.refout = refout
+        self.xorout = xorout & self.mask
+        self.check = check
+
+    def __repr__(self):
+        digits = self.width // 4
+        return (f"CRCModel({self.name!r}, width={self.width}, poly=0x{self.poly:0{digits}X}, "
+                f"init=0x{self.init:0{digits}X}, refin={self.refin}, refout={self.refout}, "
+                f"xorout=0x{self.xorout:0{digits}X})")
+
+    @property
+    def table(self) -> Tuple[int, ...]:
+        """Таблица lookup модели (из общего кэша)"""
+        return crc_table(self.width, self.poly, self.refin)
+
+    def initial_register(self) -> int:
+        """Начальное значение регистра с учётом отражения входа"""
+        return _reflect(self.init, self.width) if self.refin else self.init
+
+    def update(self, register: int, data: bytes) -> int:
+        """Продолжение расчёта: регистр после обработки data (без финализации)"""
+        # Для прямых CRC-8/CRC-16 быстрее NumPy (большие блоки) или slicing-by-8
+        if not self.refin and self.width in (8, 16) and np is not None \
+                and len(memoryview(data).cast('B')) >= _NUMPY_MIN_SIZE:
+            return _crc_numpy(data, crc_table(self.width, self.poly), self.width, register)
+        if not self.refin and self.width == 8:
+            return crc8_sliced(data, init=register,
+                               tables=_cached_slicing_tables(8, self.poly, 8))
+        if not self.refin and self.width == 16:
+            return crc16_sliced(data, init=register,
+                                tables=_cached_slicing_tables(16, self.poly, 8))
+
+        table = self.table
+        if self.refin:
+            for byte in memoryview(data).cast('B'):
+                register = (register >> 8) ^ table[(register ^ byte) & 0xFF]
+        else:
+            shift = self.width - 8
+            mask = self.mask
+            for byte in memoryview(data).cast('B'):
+                register = ((register << 8) & mask) ^ table[(register >> shift) ^ byte]
+
+        return register
+
+    def unfinalize(self, crc: int) -> int:
+        """Обратная к finalize операция: регистр по значению CRC"""
+        crc ^= self.xorout
+        if self.refin != self.refout:
+            crc = _reflect(crc, self.width)
+        return crc
+
+    def combine(self, crc_a: int, crc_b: int, len_b: int) -> int:
+        """CRC конкатенации A+B по CRC частей и длине B (как crc32_combine в zlib)"""
+        register = _gf2_shift(self.unfinalize(crc_a) ^ self.initial_register(), len_b,
+                              self.width, self.poly, self.refin)
+        return self.finalize(register ^ self.unfinalize(crc_b))
+
+    def finalize(self, register: int) -> int:
+        """Финализация регистра: отражение выхода и xorout"""
+        if self.refin != self.refout:
+            register = _reflect(register, self.width)
+        return register ^ self.xorout
+
+    def compute(self, data: bytes) -> int:
+        """Вычисление CRC по модели"""
+        return self.finalize(self.update(self.initial_register(), data))
+
+    def verify(self) -> bool:
+        """Проверка модели по контрольному значению CRC строки "123456789"""
+        return self.check is None or self.compute(b"123456789") == self.check
+
+
+# Объединение CRC (метод матриц над GF(2), как в zlib)
+def _gf2_times(matrix: Sequence[int], vector: int) -> int:
+    """Умножение матрицы GF(2) (список столбцов) на вектор-регистр"""
+    result = 0
+    column = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[column]
+        vector >>= 1
+        column += 1
+    return result
+
+
+@lru_cache(maxsize=32)
+def _zero_operators(width: int, polynomial: int,
+                    reflected: bool) -> Tuple[Tuple[int, ...], ...]:
+    """Матрицы сдвига регистра на 2^k нулевых байт, k = 0..63"""
+    if reflected:
+        # Один нулевой бит: сдвиг вправо, младший бит добавляет отражённый полином
+        one_bit = [_reflect(polynomial, width)] + [1 << (i - 1) for i in range(1, width)]
+    else:
+        one_bit = [1 << (i + 1) for i in range(width - 1)] + [polynomial]
+
+    # Возведение в квадрат: 1 -> 2 -> 4 -> 8 бит (один байт), далее по степеням двойки
+    operator = one_bit
+    for _ in range(3):
+        operator = [_gf2_times(operator, column) for column in operator]
+
+    operators = [tuple(operator)]
+    for _ in range(63):
+        operator = [_gf2_times(operator, column) for column in operator]
+        operators.append(tuple(operator))
+
+    return tuple(operators)
+
+
+def _gf2_shift(register: int, length: int, width: int, polynomial: int,
+               reflected: bool = False) -> int:
+    """Регистр CRC после обработки length нулевых байт, за O(log length) умножений"""
+    operators = _zero_operators(width, polynomial, reflected)
+    power = 0
+    while length and register:
+        if length & 1:
+            register = _gf2_times(operators[power], register)
+        length >>= 1
+        power += 1
+    return register
+
+
+def crc_combine(crc_a: int, crc_b: int, len_b: int, polynomial: int = 0x1021,
+                init: int = 0xFFFF, width: int = 16) -> int:
+    """CRC конкатенации для прямых CRC-8/CRC-16 этого модуля (без отражения и xorout)"""
+    return _gf2_shift(crc_a ^ init, len_b, width, polynomial) ^ crc_b
+
+
+# Каталог моделей (параметры и check-значения по каталогу RevEng)
+CRC_MODELS: Dict[str, CRCModel] = {model.name: model for model in [
+    CRCModel("CRC-8/SMBUS", 8, 0x07, 0x00, False, False, 0x00, check=0xF4),
+    CRCModel("CRC-8/MAXIM-DOW", 8, 0x31, 0x00, True, True, 0x00, check=0xA1),
+    CRCModel("CRC-8/AUTOSAR", 8, 0x2F, 0xFF, False, False, 0xFF, check=0xDF),
+    CRCModel("CRC-16/IBM-3740", 16, 0x1021, 0xFFFF, False, False, 0x0000, check=0x29B1),
+    CRCModel("CRC-16/XMODEM", 16, 0x1021, 0x0000, False, False, 0x0000, check=0x31C3),
+    CRCModel("CRC-16/KERMIT", 16, 0x1021, 0x0000, True, True, 0x0000, check=0x2189),
+    CRCModel("CRC-16/ARC", 16, 0x8005, 0x0000, True, True, 0x0000, check=0xBB3D),
+    CRCModel("CRC-16/MODBUS", 16, 0x8005, 0xFFFF, True, True, 0x0000, check=0x4B37),
+    CRCModel("CRC-16/USB", 16, 0x8005, 0xFFFF, True, True, 0xFFFF, check=0xB4C8),
+    CRCModel("CRC-32/ISO-HDLC", 32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF,
+             check=0xCBF43926),
+    CRCModel("CRC-32/BZIP2", 32, 0x04C11DB7, 0xFFFFFFFF, False, False, 0xFFFFFFFF,
+             check=0xFC891918),
+    CRCModel("CRC-32/MPEG-2", 32, 0x04C11DB7, 0xFFFFFFFF, False, False, 0x00000000,
+             check=0x0376E6E7),
+    CRCModel("CRC-32/ISCSI", 32, 0x1EDC6F41, 0xFFFFFFFF, True, True, 0xFFFFFFFF,
+             check=0xE3069283),
+    CRCModel("CRC-64/ECMA-182", 64, 0x42F0E1EBA9EA3693, 0, False, False, 0,
+             check=0x6C40DF5F0B497347),
+    CRCModel("CRC-64/XZ", 64, 0x42F0E1EBA9EA3693, 0xFFFFFFFFFFFFFFFF, True, True,
+             0xFFFFFFFFFFFFFFFF, check=0x995DC9BBDF1939FA),
+]}
+
+# Распространённые синонимы
+CRC_ALIASES = {
+    "CRC-8": "CRC-8/SMBUS",
+    "CRC-16/CCITT-FALSE": "CRC-16/IBM-3740",
+    "CRC-16": "CRC-16/ARC",
+    "CRC-32": "CRC-32/ISO-HDLC",
+    "CRC-32C": "CRC-32/ISCSI",
+    "CRC-64": "CRC-64/ECMA-182",
+}
+
+
+def get_crc_model(name: str) -> CRCModel:
+    """Модель CRC по имени из каталога (регистр букв не важен)"""
+    key = name.upper()
+    key = CRC_ALIASES.get(key, key)
+    if key not in CRC_MODELS:
+        raise ValueError(f"Неизвестная модель CRC: {name}")
+    return CRC_MODELS[key]
+
+
+# Потоковый расчёт (интерфейс как у hashlib)
+class CRCHash:
+    """Инкрементальный CRC: update(chunk), digest(), hexdigest(), copy()"""
+
+    def __init__(self, model="CRC-16/IBM-3740", data: bytes = b""):
+        self.model = get_crc_model(model) if isinstance(model, str) else model
+        self.name = self.model.name
+        self.digest_size = self.model.width // 8
+        self._register = self.model.initial_register()
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> None:
+        """Добавление очередного блока (bytes, bytearray, memoryview - без копирования)"""
+        self._register = self.model.update(self._register, data)
+
+    @property
+    def crc(self) -> int:
+        """Текущее значение CRC как целое число"""
+        return self.model.finalize(self._register)
+
+    def digest(self) -> bytes:
+        """CRC в виде байт (big-endian)"""
+        return self.crc.to_bytes(self.digest_size, "big")
+
+    def hexdigest(self) -> str:
+        """CRC в виде шестнадцатеричной строки"""
+        return self.digest().hex()
+
+    def copy(self) -> "CRCHash":
+        """Копия объекта с текущим состоянием регистра"""
+        clone = CRCHash.__new__(CRCHash)
+        clone.model = self.model
+        clone.name = self.name
+        clone.digest_size = self.digest_size
+        clone._register = self._register
+        return clone
+
+
+def crc_file(path: str, model="CRC-16/IBM-3740", chunk_size: int = 1 << 20) -> int:
+    """CRC файла чтением в один переиспользуемый буфер (постоянная память)"""
+    crc = CRCHash(model)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+
+    with open(path, "rb") as file:
+        while True:
+            read = file.readinto(buffer)
+            if not read:
+                break
+            crc.update(view[:read])
+
+    return crc.crc
+
+
+# Параллельный расчёт CRC файла
+def _crc_file_chunk(path: str, model: "CRCModel", start: int, stop: int) -> int:
+    """CRC участка файла [start, stop) через mmap (выполняется в процессе пула)"""
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return model.compute(view[start:stop])
+            finally:
+                view.release()
+
+
+def crc_file_parallel(path: str, model="CRC-16/IBM-3740", workers: int = None,
+                      chunk_size: int = None) -> int:
+    """CRC файла: участки считаются в пуле процессов и склеиваются через combine"""
+    model = get_crc_model(model) if isinstance(model, str) else model
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = max(1 << 20, -(-size // workers))
+    if size <= chunk_size or workers == 1:
+        return crc_file(path, model)
+
+    bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partial = list(pool.map(_crc_file_chunk, [path] * len(bounds), [model] * len(bounds),
+                                [start for start, _ in bounds], [stop for _, stop in bounds]))
+
+    crc = partial[0]
+    for (start, stop), chunk_crc in zip(bounds[1:], partial[1:]):
+        crc = model.combine(crc, chunk_crc, stop - start)
+
+    return crc
+
 
-    print(f"Табличный: 0x{crc16_tbl:04X} ({crc16_tbl:5d}) - Время: {time_tbl*1e6:8.2f} µs")
-    print(f"Совпадение: {crc16_bit == crc16_tbl} | Ускорение: {time_bit/time_tbl:.2f}x")
+# Кадры с CRC-16: обнаружение и исправление однобитовых ошибок
+def encode_frames(data: bytes, payload_size: int = 64, polynomial: int = 0x1021,
+                  init: int = 0xFFFF) -> List[bytes]:
+    """Разбиение потока на кадры: полезные данные + CRC-16 (big-endian)"""
+    view = memoryview(data).cast('B')
+    table = crc_table(16, polynomial)
+    frames = []
+
+    for start in range(0, len(view), payload_size):
+        payload = view[start:start + payload_size]
+        crc = crc16_sliced(payload, init=init, tables=_cached_slicing_tables(16, polynomial, 8)) \
+            if len(payload) >= 64 else crc16_table(payload, init=init, table=table)
+        frames.append(bytes(payload) + crc.to_bytes(2, 'big'))
+
+    return frames
+
+
+def validate_frames(frames: Sequence[bytes], polynomial: int = 0x1021,
+                    init: int = 0xFFFF) -> List[bool]:
+    """Пакетная проверка кадров: CRC кадра вместе с полем CRC равен нулю"""
+    table = crc_table(16, polynomial)
+    if np is None:
+        return [crc16_table(frame, init=init, table=table) == 0 for frame in frames]
+
+    # Кадры одинаковой длины проверяются одной матрицей
+    by_length = {}
+    for index, frame in enumerate(frames):
+        by_length.setdefault(len(frame), []).append(index)
+
+    lut = np.array(table, dtype=np.uint32)
+    valid = [False] * len(frames)
+    for length, indices in by_length.items():
+        rows = np.frombuffer(b"".join(frames[i] for i in indices),
+                             dtype=np.uint8).reshape(len(indices), length)
+        regs = _crc_rows(rows, lut, 16, np.full(len(indices), init, dtype=np.uint32))
+        for index, ok in zip(indices, (regs == 0).tolist()):
+            valid[index] = ok
+
+    return valid
+
+
+@lru_cache(maxsize=32)
+def _syndrome_table(polynomial: int, frame_bytes: int) -> Dict[int, int]:
+    """Синдром -> номер бита от конца кадра (неоднозначные синдромы -> -1)"""
+    # Ошибка в бите k от конца даёт остаток x^(k+16) mod G
+    syndrome = crc_table(16, polynomial)[1]
+    positions = {}
+
+    for bit in range(frame_bytes * 8):
+        positions[syndrome] = -1 if syndrome in positions else bit
+        syndrome = ((syndrome << 1) ^ polynomial if syndrome & 0x8000 else syndrome << 1) & 0xFFFF
+
+    return positions
+
+
+def correct_frame(frame: bytes, polynomial: int = 0x1021,
+                  init: int = 0xFFFF) -> Tuple[bytes, str]:
+    """Исправление однобитовой ошибки по таблице синдромов: (кадр или None, статус)"""
+    syndrome = crc16_table(frame, init=init, table=crc_table(16, polynomial))
+    if syndrome == 0:
+        return bytes(frame), 'ok'
+
+    bit = _syndrome_table(polynomial, len(frame)).get(syndrome, -1)
+    if bit < 0:
+        return None, 'error'
+
+    fixed = bytearray(frame)
+    fixed[len(fixed) - 1 - bit // 8] ^= 1 << (bit % 8)
+    return bytes(fixed), 'corrected'
+
+
+def decode_frames(frames: Sequence[bytes], polynomial: int = 0x1021,
+                  init: int = 0xFFFF) -> Tuple[bytes, Dict[str, object]]:
+    """Сборка потока из кадров с исправлением; неисправимые кадры - в stats['lost']"""
+    stats = {'ok': 0, 'corrected': 0, 'lost': []}
+    payloads = []
+
+    for index, (frame, ok) in enumerate(zip(frames, validate_frames(frames, polynomial, init))):
+        if not ok:
+            frame, status = correct_frame(frame, polynomial, init)
+            if frame is None:
+                stats['lost'].append(index)
+                continue
+            stats['corrected'] += 1
+        else:
+            stats['ok'] += 1
+        payloads.append(frame[:-2])
+
+    return b"".join(payloads), stats
+
+
+# Тестирование и сравнение
+# Движки: имя -> (CRC-8, CRC-16, максимальный размер данных для замера)
+CRC_ENGINES = {
+    'bitwise': (crc8_bitwise, crc16_bitwise, 1 << 20),
+    'table': (lambda data: crc8_table(data), lambda data: crc16_table(data), 1 << 26),
+    'sliced': (lambda data: crc8_sliced(data), lambda data: crc16_sliced(data), 1 << 28),
+    'numpy': (lambda data: crc8_numpy(data), lambda data: crc16_numpy(data), None),
+}
+
+
+def _throughput(size: int, seconds: float) -> float:
+    """Пропускная способность в МБ/с"""
+    return size / seconds / 1e6 if seconds > 0 else float('inf')
+
+
+# Меньше замеров не различают p95 и максимум
+P95_MIN_SAMPLES = 20
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Перцентиль с линейной интерполяцией между соседними значениями"""
+    ordered = sorted(values)
+    position = percent / 100 * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _format_us(seconds) -> str:
+    """Время в µs для таблицы (прочерк, если значение не определено)"""
+    return f"{seconds * 1e6:.2f}" if seconds is not None else "—"
+
+
+def measure(func, data, warmup: int = 2, repeats: int = P95_MIN_SAMPLES, min_time: float = 1e-3,
+            budget: float = 5.0) -> Dict[str, float]:
+    """Замер времени одного вызова: прогрев, повторы, медиана, p95 (от 20 замеров) и максимум"""
+    for _ in range(warmup):
+        func(data)
+
+    # Короткие вызовы группируются, чтобы один замер длился не меньше min_time
+    started = time.perf_counter()
+    func(data)
+    single = time.perf_counter() - started
+    number = max(1, int(min_time / single)) if single > 0 else 1000
+
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < repeats and (len(samples) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        for _ in range(number):
+            func(data)
+        samples.append((time.perf_counter() - started) / number)
+
+    median = statistics.median(samples)
+    return {
+        'median_s': median,
+        'p95_s': _percentile(samples, 95) if len(samples) >= P95_MIN_SAMPLES else None,
+        'max_s': max(samples),
+        'mb_s': _throughput(len(data), median),
+        'samples': len(samples),
+        'number': number,
+    }
+
+
+def benchmark_sizes(min_size: int = 64, max_size: int = 1 << 30, factor: int = 4) -> List[int]:
+    """Размеры данных от min_size до max_size с шагом factor"""
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= factor
+    return sizes
+
+
+def run_crc_benchmark(sizes: Sequence[int] = None, engines: Sequence[str] = None,
+                      widths: Sequence[int] = (8, 16), warmup: int = 2, repeats: int = P95_MIN_SAMPLES,
+                      csv_path: str = None, json_path: str = 'crc_benchmark.json') -> dict:
+    """Замеры всех движков на сетке размеров, результат в CSV/JSON"""
+    sizes = list(sizes or benchmark_sizes())
+    engines = [name for name in (engines or CRC_ENGINES)
+               if name != 'numpy' or np is not None]
+
+    # Один буфер случайных данных, меньшие размеры - срезы без копирования
+    payload = memoryview(os.urandom(max(sizes)))
+    results = []
+
+    print(f"{'CRC':<7} {'Движок':<8} {'Размер':>12} {'Медиана, µs':>14} {'p95, µs':>14} "
+          f"{'Макс., µs':>14} {'Замеров':>8} {'МБ/с':>10}")
+    for width in widths:
+        for size in sizes:
+            data = payload[:size]
+            for name in engines:
+                crc8_func, crc16_func, max_size = CRC_ENGINES[name]
+                if max_size is not None and size > max_size:
+                    continue
+
+                stats = measure(crc8_func if width == 8 else crc16_func, data, warmup, repeats)
+                record = {'crc': f'CRC-{width}', 'engine': name, 'size': size, **stats}
+                results.append(record)
+                print(f"{record['crc']:<7} {name:<8} {size:>12} {stats['median_s'] * 1e6:>14.2f} "
+                      f"{_format_us(stats['p95_s']):>14} {stats['max_s'] * 1e6:>14.2f} "
+                      f"{stats['samples']:>8} {stats['mb_s']:>10.2f}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__ if np is not None else None,
+        'platform': platform.platform(),
+        'warmup': warmup,
+        'repeats': repeats,
+        'results': results,
+    }
+    if json_path is not None:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты записаны в {json_path}")
+    if csv_path is not None:
+        with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Результаты записаны в {csv_path}")
+    return report
+
+
+def compare_methods(data: bytes, warmup: int = 1,
+                    repeats: int = P95_MIN_SAMPLES) -> Dict[str, Dict[str, float]]:
+    """Сравнение методов на одних данных (медиана повторных замеров и МБ/с)"""
+    print("=" * 70)
+    print(f"Тестовые данные: {data[:50]}{'...' if len(data) > 50 else ''}")
+    print(f"Длина данных: {len(data)} байт")
     print("=" * 70)
 
+    results = {}
+    for width, digits in ((8, 2), (16, 4)):
+        print(f"\nРезультаты CRC-{width}:")
+        print("-" * 70)
+
+        reference = None
+        base_time = None
+        for name, (crc8_func, crc16_func, _) in CRC_ENGINES.items():
+            if name == 'numpy' and np is None:
+                continue
+            func = crc8_func if width == 8 else crc16_func
+            value = func(data)
+            stats = measure(func, data, warmup, repeats)
+
+            if reference is None:
+                reference, base_time = value, stats['median_s']
+            results[f"CRC-{width} {name}"] = {'crc': value, **stats}
+
+            print(f"{name:<8} 0x{value:0{digits}X} - Медиана: {stats['median_s'] * 1e6:10.2f} µs"
+                  f" | p95: {_format_us(stats['p95_s']):>10} µs | {stats['mb_s']:8.2f} МБ/с"
+                  f" | Совпадение: {value == reference}"
+                  f" | Ускорение: {base_time / stats['median_s']:.2f}x")
+
+    print("=" * 70)
+    return results
+
 
 def main():
     """Основная функция тестирования"""
+    for model in CRC_MODELS.values():
+        status = "OK" if model.verify() else "ОШИБКА"
+        print(f"{model.name:<18} check=0x{model.compute(b'123456789'):0{model.width // 4}X} {status}")
+    print()
+
     test_cases = [
         b"Hello, World!",
         b"A" * 100,
@@ -173,4 +879,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python crc.py --benchmark [ФАЙЛ.json] [--csv ФАЙЛ.csv] [--max-size БАЙТ]
+    if '--benchmark' in sys.argv[1:]:
+        args = sys.argv[1:]
+        position = args.index('--benchmark') + 1
+        json_path = args[position] if position < len(args) and not args[position].startswith('--') \
+            else 'crc_benchmark.json'
+        csv_path = args[args.index('--csv') + 1] if '--csv' in args else None
+        max_size = int(args[args.index('--max-size') + 1]) if '--max-size' in args else 1 << 30
+        run_crc_benchmark(benchmark_sizes(max_size=max_size), csv_path=csv_path, json_path=json_path)
+    else:
+        main()
\ No newline at end of file
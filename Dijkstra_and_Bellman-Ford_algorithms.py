@@ -1,10 +1,481 @@
+import os
+import sys
+import matplotlib
+# Без дисплея (сервер, пакетная задача) рисуем через Agg в файлы
+if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
-from collections import defaultdict, deque
+from array import array
+from collections import OrderedDict, defaultdict, deque
+import hashlib
 import heapq
+import json
+import math
+import mmap
+import platform
+import random
+import struct
+import subprocess
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
-def dijkstra(graph, start_node):
+class CSRGraph:
+
+    # Граф в формате CSR (compressed sparse row): исходящие рёбра вершины i
+    # лежат в targets[offsets[i]:offsets[i + 1]] и weights[offsets[i]:offsets[i + 1]].
+    # Вершины хранятся целыми индексами, nodes переводит индекс в имя вершины.
+
+    def __init__(self, offsets, targets, weights, nodes):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.nodes = nodes
+        # Для nodes = range(...) индекс вычисляется без словаря
+        self.index = None if isinstance(nodes, range) else {name: i for i, name in enumerate(nodes)}
+        # (все веса целые, минимальный, максимальный вес) - считается один раз
+        self.weight_range = None
+
+    def node_index(self, name):
+        if self.index is None:
+            return self.nodes.index(name)
+        return self.index[name]
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def weight_typecode(self):
+        # 'q' для целых весов, 'd' для вещественных (array.array или memoryview)
+        weights = self.weights
+        return weights.typecode if isinstance(weights, array) else weights.format
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, name):
+        if self.index is None:
+            return name in self.nodes
+        return name in self.index
+
+    def __getitem__(self, name):
+        # Соседи вершины в том же виде, что и у словаря словарей
+        u = self.node_index(name)
+        nodes = self.nodes
+        return {nodes[self.targets[e]]: self.weights[e]
+                for e in range(self.offsets[u], self.offsets[u + 1])}
+
+    def to_dict(self):
+        return {name: self[name] for name in self.nodes}
+
+def to_csr(graph):
+
+    # Преобразование словаря словарей {u: {v: w}} в CSRGraph.
+    # Порядок вершин и рёбер сохраняется, поэтому обход совпадает со словарным.
+    nodes = list(graph)
+    index = {name: i for i, name in enumerate(nodes)}
+    for node in graph:
+        for neighbor in graph[node]:
+            if neighbor not in index:
+                index[neighbor] = len(nodes)
+                nodes.append(neighbor)
+
+    all_int = all(isinstance(w, int) for node in graph for w in graph[node].values())
+    offsets = array('q', [0])
+    targets = array('q')
+    weights = array('q' if all_int else 'd')
+
+    for name in nodes:
+        for neighbor, weight in graph.get(name, {}).items():
+            targets.append(index[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+
+    return CSRGraph(offsets, targets, weights, nodes)
+
+def _named(graph, values):
+
+    # Список значений по индексам вершин -> словарь по именам вершин
+    return dict(zip(graph.nodes, values))
+
+# Режимы записи шагов алгоритма:
+#   'off'     - шаги не записываются;
+#   'summary' - один итоговый элемент со счётчиками (по умолчанию);
+#   'diff'    - на каждом шаге только изменения (вершина, старое, новое расстояние);
+#   'full'    - на каждом шаге полная копия расстояний, как нужно для визуализации.
+TRACE_MODES = ('off', 'summary', 'diff', 'full')
+
+def _check_trace(trace):
+
+    if trace not in TRACE_MODES:
+        raise ValueError(f"Неизвестный режим трассировки {trace!r}, ожидается один из {TRACE_MODES}")
+
+# Очереди с приоритетами для dijkstra(). Общий интерфейс: push(item, priority)
+# добавляет элемент или улучшает его приоритет, pop() -> (priority, item),
+# len(queue) и stats() со счётчиками операций. Очереди с ленивым удалением
+# могут вернуть устаревшую запись - dijkstra() её пропускает.
+
+class LazyHeapQueue:
+
+    # Двоичная куча heapq с ленивым удалением: каждое улучшение - новая запись
+
+    kind = 'heap'
+
+    def __init__(self):
+        self.heap = []
+        self.pushes = 0
+        self.pops = 0
+        self.max_size = 0
+
+    def push(self, item, priority):
+        heapq.heappush(self.heap, (priority, item))
+        self.pushes += 1
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def stats(self):
+        return {'queue': self.kind, 'pushes': self.pushes, 'pops': self.pops, 'max_size': self.max_size}
+
+class IndexedHeapQueue(LazyHeapQueue):
+
+    # Двоичная куча с индексом позиций: улучшение приоритета - decrease-key на месте,
+    # поэтому каждая вершина лежит в очереди не более одного раза. Подходит для
+    # вещественных весов
+
+    kind = 'indexed'
+
+    def __init__(self):
+        super().__init__()
+        self.priority = {}
+        self.position = {}
+
+    def _sift_up(self, i):
+        heap, priority, position = self.heap, self.priority, self.position
+        item = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if priority[heap[parent]] <= priority[item]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = item
+        position[item] = i
+
+    def _sift_down(self, i):
+        heap, priority, position = self.heap, self.priority, self.position
+        size = len(heap)
+        item = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and priority[heap[child + 1]] < priority[heap[child]]:
+                child += 1
+            if priority[heap[child]] >= priority[item]:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = item
+        position[item] = i
+
+    def push(self, item, priority):
+        self.pushes += 1
+        if item in self.position:
+            if priority < self.priority[item]:
+                self.priority[item] = priority
+                self._sift_up(self.position[item])
+            return
+        self.priority[item] = priority
+        self.heap.append(item)
+        self._sift_up(len(self.heap) - 1)
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        del self.position[top]
+        return self.priority.pop(top), top
+
+class RadixHeapQueue(LazyHeapQueue):
+
+    # Radix-куча для целых неотрицательных весов. Извлекаемые приоритеты не убывают,
+    # элемент с приоритетом p лежит в корзине номер bit_length(p xor last).
+    # Каждый элемент перекладывается не более log2(C) раз
+
+    kind = 'radix'
+
+    def __init__(self):
+        super().__init__()
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def push(self, item, priority):
+        self.buckets[(priority ^ self.last).bit_length()].append((priority, item))
+        self.pushes += 1
+        self.size += 1
+        if self.size > self.max_size:
+            self.max_size = self.size
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            # Новый минимум становится last, корзина i раскладывается по младшим корзинам
+            entries = buckets[i]
+            buckets[i] = []
+            last = self.last = min(entry[0] for entry in entries)
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+        self.pops += 1
+        self.size -= 1
+        return buckets[0].pop()
+
+    def __len__(self):
+        return self.size
+
+class DialQueue(LazyHeapQueue):
+
+    # Очередь Дейкстры-Дайала: циклический массив из max_weight + 1 корзин.
+    # Все приоритеты в очереди лежат в окне [текущий, текущий + max_weight]
+
+    kind = 'dial'
+
+    def __init__(self, max_weight):
+        super().__init__()
+        self.buckets = [[] for _ in range(max_weight + 1)]
+        self.current = 0
+        self.size = 0
+
+    def push(self, item, priority):
+        self.buckets[priority % len(self.buckets)].append((priority, item))
+        self.pushes += 1
+        self.size += 1
+        if self.size > self.max_size:
+            self.max_size = self.size
+
+    def pop(self):
+        buckets = self.buckets
+        width = len(buckets)
+        while not buckets[self.current % width]:
+            self.current += 1
+        self.pops += 1
+        self.size -= 1
+        return buckets[self.current % width].pop()
+
+    def __len__(self):
+        return self.size
+
+QUEUE_KINDS = ('auto', 'heap', 'indexed', 'radix', 'dial')
+
+def _weight_range(graph):
+
+    # (все веса целые, минимальный вес, максимальный вес)
+    if isinstance(graph, CSRGraph):
+        if graph.weight_range is None:
+            weights = graph.weights
+            all_int = graph.weight_typecode == 'q'
+            graph.weight_range = (all_int, min(weights), max(weights)) if len(weights) else (all_int, 0, 0)
+        return graph.weight_range
+
+    all_int = True
+    low = high = 0
+    for node in graph:
+        for weight in graph[node].values():
+            if not isinstance(weight, int):
+                all_int = False
+            if weight < low:
+                low = weight
+            if weight > high:
+                high = weight
+    return all_int, low, high
+
+def make_queue(graph, kind='auto', weight_range=None):
+
+    # Выбор очереди для dijkstra(). 'auto': для целых весов до 1024 - dial,
+    # иначе обычная куча heapq (в CPython она реализована на C и при больших
+    # весах обгоняет radix-кучу и кучу с decrease-key, написанные на Python).
+    # weight_range - уже известный (все веса целые, минимум, максимум): у
+    # словарного графа иначе каждый вызов просматривает все рёбра (у CSRGraph
+    # диапазон кэшируется в самом графе). Границы могут быть и более широкими
+    if kind not in QUEUE_KINDS:
+        raise ValueError(f"Неизвестная очередь {kind!r}, ожидается одна из {QUEUE_KINDS}")
+    if kind == 'heap':
+        return LazyHeapQueue()
+    if kind == 'indexed':
+        return IndexedHeapQueue()
+
+    all_int, low, high = weight_range if weight_range is not None else _weight_range(graph)
+    if kind == 'auto':
+        kind = 'dial' if all_int and low >= 0 and high <= 1024 else 'heap'
+        if kind == 'heap':
+            return LazyHeapQueue()
+
+    if not all_int or low < 0:
+        raise ValueError(f"Очередь {kind!r} требует целых неотрицательных весов")
+    return RadixHeapQueue() if kind == 'radix' else DialQueue(high)
+
+def _dijkstra_csr(graph, start_node, trace, queue):
+
+    n = len(graph)
+    names = graph.nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    full = trace == 'full'
+    diff = trace == 'diff'
+
+    distances = [float('infinity')] * n
+    previous = [-1] * n
+    start = graph.node_index(start_node)
+    distances[start] = 0
+
+    queue.push(start, 0)
+    visited_nodes = []
+    steps = []
+    relaxations = 0
+
+    while queue:
+        current_distance, u = queue.pop()
+
+        if current_distance > distances[u]:
+            continue
+
+        visited_nodes.append(names[u])
+
+        if full:
+            steps.append({
+                'current_node': names[u],
+                'distances': _named(graph, distances),
+                'visited': visited_nodes.copy()
+            })
+        elif diff:
+            changes = []
+            steps.append({'current_node': names[u], 'changes': changes})
+
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            distance = current_distance + weights[e]
+
+            if distance < distances[v]:
+                if diff:
+                    changes.append((names[v], distances[v], distance))
+                distances[v] = distance
+                previous[v] = u
+                relaxations += 1
+                queue.push(v, distance)
+
+    if trace == 'summary':
+        steps.append({'visited': visited_nodes, 'settled': len(visited_nodes),
+                      'relaxations': relaxations, **queue.stats()})
+
+    previous_nodes = {names[v]: (names[u] if u >= 0 else None) for v, u in enumerate(previous)}
+    return _named(graph, distances), previous_nodes, steps
+
+def _bellman_ford_csr(graph, start_node, trace):
+
+    n = len(graph)
+    names = graph.nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    inf = float('infinity')
+    full = trace == 'full'
+    diff = trace == 'diff'
+
+    distances = [inf] * n
+    previous = [-1] * n
+    distances[graph.node_index(start_node)] = 0
+
+    steps = []
+    relaxations = 0
+    iterations = 0
+
+    # Рёбра не копируются: проход идёт прямо по массивам CSR
+    for i in range(n - 1):
+        updated = False
+        changes = []
+        for u in range(n):
+            du = distances[u]
+            if du == inf:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if du + weights[e] < distances[v]:
+                    if diff:
+                        changes.append((names[v], distances[v], du + weights[e]))
+                    distances[v] = du + weights[e]
+                    previous[v] = u
+                    updated = True
+                    relaxations += 1
+                    # distances[u] мог уменьшиться, если есть петля u -> u
+                    du = distances[u]
+
+        iterations += 1
+        if full:
+            steps.append({
+                'iteration': i + 1,
+                'distances': _named(graph, distances),
+                'updated': updated
+            })
+        elif diff:
+            steps.append({'iteration': i + 1, 'changes': changes, 'updated': updated})
+
+        if not updated:
+            break
+
+    has_negative_cycle = False
+    for u in range(n):
+        du = distances[u]
+        if du == inf:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            if du + weights[e] < distances[targets[e]]:
+                has_negative_cycle = True
+                break
+        if has_negative_cycle:
+            break
+
+    if trace == 'summary':
+        steps.append({'iterations': iterations, 'relaxations': relaxations})
+
+    previous_nodes = {names[v]: (names[u] if u >= 0 else None) for v, u in enumerate(previous)}
+    return _named(graph, distances), previous_nodes, steps, has_negative_cycle
+
+def dijkstra(graph, start_node, trace='summary', queue='auto', weight_range=None):
+
+    _check_trace(trace)
+    # queue - вид очереди с приоритетами (см. make_queue) или готовый объект очереди;
+    # weight_range передаётся в make_queue, чтобы повторные вызовы не просматривали веса
+    if isinstance(queue, str):
+        queue = make_queue(graph, queue, weight_range)
+
+    # Граф в формате CSR обрабатывается по массивам, без словарей
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, start_node, trace, queue)
+
+    full = trace == 'full'
+    diff = trace == 'diff'
 
     # Инициализация расстояний
     distances = {node: float('infinity') for node in graph}
@@ -12,13 +483,14 @@ def dijkstra(graph, start_node):
     previous_nodes = {node: None for node in graph}
     
     # Очередь с приоритетами
-    priority_queue = [(0, start_node)]
+    queue.push(start_node, 0)
     
     visited_nodes = []
     steps = []  # Для записи шагов алгоритма
+    relaxations = 0
     
-    while priority_queue:
-        current_distance, current_node = heapq.heappop(priority_queue)
+    while queue:
+        current_distance, current_node = queue.pop()
         
         # Если уже нашли более короткий путь - пропускаем
         if current_distance > distances[current_node]:
@@ -27,11 +499,15 @@ def dijkstra(graph, start_node):
         visited_nodes.append(current_node)
         
         # Записываем текущее состояние
-        steps.append({
-            'current_node': current_node,
-            'distances': distances.copy(),
-            'visited': visited_nodes.copy()
-        })
+        if full:
+            steps.append({
+                'current_node': current_node,
+                'distances': distances.copy(),
+                'visited': visited_nodes.copy()
+            })
+        elif diff:
+            changes = []
+            steps.append({'current_node': current_node, 'changes': changes})
         
         # Обход соседей
         for neighbor, weight in graph[current_node].items():
@@ -39,13 +515,28 @@ def dijkstra(graph, start_node):
             
             # Если нашли более короткий путь
             if distance < distances[neighbor]:
+                if diff:
+                    changes.append((neighbor, distances[neighbor], distance))
                 distances[neighbor] = distance
                 previous_nodes[neighbor] = current_node
-                heapq.heappush(priority_queue, (distance, neighbor))
+                relaxations += 1
+                queue.push(neighbor, distance)
+    
+    if trace == 'summary':
+        steps.append({'visited': visited_nodes, 'settled': len(visited_nodes),
+                      'relaxations': relaxations, **queue.stats()})
     
     return distances, previous_nodes, steps
 
-def bellman_ford(graph, start_node):
+def bellman_ford(graph, start_node, trace='summary'):
+
+    _check_trace(trace)
+
+    if isinstance(graph, CSRGraph):
+        return _bellman_ford_csr(graph, start_node, trace)
+
+    full = trace == 'full'
+    diff = trace == 'diff'
 
     # Инициализация расстояний
     distances = {node: float('infinity') for node in graph}
@@ -60,22 +551,32 @@ def bellman_ford(graph, start_node):
     
     steps = []
     n = len(graph)
+    relaxations = 0
+    iterations = 0
     
     # Основной цикл релаксации
     for i in range(n - 1):
         updated = False
+        changes = []
         for u, v, w in edges:
             if distances[u] != float('infinity') and distances[u] + w < distances[v]:
+                if diff:
+                    changes.append((v, distances[v], distances[u] + w))
                 distances[v] = distances[u] + w
                 previous_nodes[v] = u
                 updated = True
+                relaxations += 1
         
+        iterations += 1
         # Записываем состояние после итерации
-        steps.append({
-            'iteration': i + 1,
-            'distances': distances.copy(),
-            'updated': updated
-        })
+        if full:
+            steps.append({
+                'iteration': i + 1,
+                'distances': distances.copy(),
+                'updated': updated
+            })
+        elif diff:
+            steps.append({'iteration': i + 1, 'changes': changes, 'updated': updated})
         
         if not updated:
             break
@@ -87,36 +588,1498 @@ def bellman_ford(graph, start_node):
             has_negative_cycle = True
             break
     
+    if trace == 'summary':
+        steps.append({'iterations': iterations, 'relaxations': relaxations})
+    
     return distances, previous_nodes, steps, has_negative_cycle
 
-def visualize_graph(graph, shortest_paths=None, title="Graph Visualization", algorithm_name=""):
+def _predecessor_cycle(previous, node):
+
+    # Цикл в графе предшественников, достижимый из node по ссылкам previous
+    position = {}
+    path = []
+    while node is not None and node not in position:
+        position[node] = len(path)
+        path.append(node)
+        node = previous[node]
+    if node is None:
+        return None
+    cycle = path[position[node]:]
+    # Ссылки previous идут против рёбер, поэтому разворачиваем
+    cycle.reverse()
+    return cycle
+
+def spfa(graph, start_node, stats=None):
+
+    # Bellman-Ford с очередью (SPFA): релаксируются только исходящие рёбра вершин,
+    # расстояние до которых изменилось. Отрицательный цикл обнаруживается по числу
+    # рёбер в пути (n и более) и возвращается списком вершин в порядке обхода.
+    # Возвращает (расстояния, предшественники, отрицательный цикл или None);
+    # если передан словарь stats, в него записываются счётчики релаксаций
+    # и операций очереди (те же ключи, что в сводке dijkstra())
+    edges = _edges_of(graph)
+    ids = range(len(graph)) if isinstance(graph, CSRGraph) else list(graph)
+    n = len(ids)
+    inf = float('infinity')
+
+    distances = {u: inf for u in ids}
+    previous = {u: None for u in ids}
+    path_length = {u: 0 for u in ids}
+
+    start = _node_id(graph, start_node)
+    distances[start] = 0
+    queue = deque([start])
+    in_queue = {start}
+    negative_cycle = None
+    relaxations = 0
+    pushes = 1
+    pops = 0
+    max_size = 1
+
+    while queue:
+        u = queue.popleft()
+        in_queue.discard(u)
+        pops += 1
+        du = distances[u]
+
+        for v, weight in edges(u):
+            if du + weight < distances[v]:
+                distances[v] = du + weight
+                previous[v] = u
+                path_length[v] = path_length[u] + 1
+                relaxations += 1
+
+                # Путь из n и более рёбер повторяет вершину - значит, есть отрицательный цикл
+                if path_length[v] >= n:
+                    negative_cycle = _predecessor_cycle(previous, v)
+                    if negative_cycle is None:
+                        for node in ids:
+                            negative_cycle = _predecessor_cycle(previous, node)
+                            if negative_cycle is not None:
+                                break
+                    queue.clear()
+                    break
 
+                if v not in in_queue:
+                    queue.append(v)
+                    in_queue.add(v)
+                    pushes += 1
+                    max_size = max(max_size, len(queue))
+
+    if stats is not None:
+        stats.update({'settled': pops, 'relaxations': relaxations, 'queue': 'fifo',
+                      'pushes': pushes, 'pops': pops, 'max_size': max_size})
+
+    if isinstance(graph, CSRGraph):
+        names = graph.nodes
+        distances = {names[u]: distances[u] for u in ids}
+        previous = {names[v]: (names[u] if u is not None else None) for v, u in previous.items()}
+        if negative_cycle is not None:
+            negative_cycle = _node_names(graph, negative_cycle)
+
+    return distances, previous, negative_cycle
+
+def reconstruct_path(previous_nodes, target_node):
+
+    # Восстановление пути по словарю предшественников
+    path = []
+    current = target_node
+    while current is not None:
+        path.append(current)
+        current = previous_nodes[current]
+    path.reverse()
+    return path
+
+def _edges_of(graph):
+
+    # Функция u -> пары (сосед, вес) во внутренних обозначениях графа:
+    # для CSR это индексы вершин, для словаря - сами имена
+    if isinstance(graph, CSRGraph):
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        return lambda u: zip(targets[offsets[u]:offsets[u + 1]], weights[offsets[u]:offsets[u + 1]])
+    return lambda u: graph[u].items()
+
+def _node_id(graph, name):
+
+    return graph.node_index(name) if isinstance(graph, CSRGraph) else name
+
+def _node_names(graph, ids):
+
+    if isinstance(graph, CSRGraph):
+        return [graph.nodes[u] for u in ids]
+    return list(ids)
+
+def reverse_graph(graph):
+
+    # Обратный индекс смежности: ребро u -> v становится v -> u
+    if isinstance(graph, CSRGraph):
+        n = len(graph)
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        counts = [0] * (n + 1)
+        for v in targets:
+            counts[v + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        rev_offsets = array('q', counts)
+        rev_targets = array('q', bytes(8 * len(targets)))
+        rev_weights = array(graph.weight_typecode, bytes(8 * len(targets)))
+        cursor = counts[:-1]
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                rev_targets[cursor[v]] = u
+                rev_weights[cursor[v]] = weights[e]
+                cursor[v] += 1
+        return CSRGraph(rev_offsets, rev_targets, rev_weights, graph.nodes)
+
+    reverse = {node: {} for node in graph}
+    for node in graph:
+        for neighbor, weight in graph[node].items():
+            reverse.setdefault(neighbor, {})[node] = weight
+    return reverse
+
+def shortest_path(graph, start_node, target_node):
+
+    # Дейкстра от start_node с остановкой, как только target_node извлечена из очереди.
+    # Возвращает (длина, путь, число зафиксированных вершин)
+    edges = _edges_of(graph)
+    start = _node_id(graph, start_node)
+    target = _node_id(graph, target_node)
+
+    distances = {start: 0}
+    previous = {start: None}
+    settled = set()
+    priority_queue = [(0, start)]
+
+    while priority_queue:
+        current_distance, u = heapq.heappop(priority_queue)
+
+        if u in settled:
+            continue
+        settled.add(u)
+
+        if u == target:
+            path = reconstruct_path(previous, target)
+            return current_distance, _node_names(graph, path), len(settled)
+
+        for v, weight in edges(u):
+            distance = current_distance + weight
+            if v not in settled and distance < distances.get(v, float('infinity')):
+                distances[v] = distance
+                previous[v] = u
+                heapq.heappush(priority_queue, (distance, v))
+
+    return float('infinity'), [], len(settled)
+
+def bidirectional_dijkstra(graph, start_node, target_node, reverse=None):
+
+    # Двунаправленный Дейкстра: прямой поиск от start_node и обратный от target_node
+    # по обратному индексу смежности. reverse можно построить один раз через
+    # reverse_graph(graph) и передавать во все запросы к одному графу
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    start = _node_id(graph, start_node)
+    target = _node_id(graph, target_node)
+    if start == target:
+        return 0, _node_names(graph, [start]), 1
+
+    inf = float('infinity')
+    edges = (_edges_of(graph), _edges_of(reverse))
+    distances = ({start: 0}, {target: 0})
+    previous = ({start: None}, {target: None})
+    settled = (set(), set())
+    queues = ([(0, start)], [(0, target)])
+
+    best = inf
+    meeting_node = None
+
+    while queues[0] and queues[1]:
+        # Останов: никакой путь через ещё не зафиксированные вершины не короче best
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+
+        # Расширяем направление с меньшей очередью
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        other = 1 - side
+        current_distance, u = heapq.heappop(queues[side])
+
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+
+        for v, weight in edges[side](u):
+            distance = current_distance + weight
+            if distance < distances[side].get(v, inf):
+                distances[side][v] = distance
+                previous[side][v] = u
+                heapq.heappush(queues[side], (distance, v))
+
+            # Кандидат на кратчайший путь через ребро u - v
+            if v in distances[other]:
+                total = distance + distances[other][v]
+                if total < best:
+                    best = total
+                    meeting_node = v
+
+    settled_count = len(settled[0]) + len(settled[1])
+    if meeting_node is None:
+        return inf, [], settled_count
+
+    path = reconstruct_path(previous[0], meeting_node)
+    current = previous[1][meeting_node]
+    while current is not None:
+        path.append(current)
+        current = previous[1][current]
+
+    return best, _node_names(graph, path), settled_count
+
+def euclidean_heuristic(coordinates):
+
+    # coordinates: {вершина: (x, y)}. Оценка допустима, если вес ребра
+    # не меньше евклидова расстояния между его концами
+    def heuristic(node, target):
+        (x1, y1), (x2, y2) = coordinates[node], coordinates[target]
+        return math.hypot(x2 - x1, y2 - y1)
+    return heuristic
+
+def haversine_heuristic(coordinates, radius=6371.0):
+
+    # coordinates: {вершина: (широта, долгота)} в градусах, результат в единицах radius
+    # (по умолчанию километры) - длина дуги большого круга
+    radians = {node: (math.radians(lat), math.radians(lon)) for node, (lat, lon) in coordinates.items()}
+
+    def heuristic(node, target):
+        (lat1, lon1), (lat2, lon2) = radians[node], radians[target]
+        a = (math.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+    return heuristic
+
+def choose_landmarks(graph, count, first=None):
+
+    # Выбор ориентиров "самая далёкая вершина": каждый следующий ориентир -
+    # достижимая вершина, наиболее удалённая от уже выбранных
+    nodes = list(graph)
+    landmarks = [nodes[0] if first is None else first]
+    weight_range = _weight_range(graph)
+    closest = dijkstra(graph, landmarks[0], trace='off', weight_range=weight_range)[0]
+
+    while len(landmarks) < min(count, len(nodes)):
+        candidates = [node for node in nodes if node not in landmarks and closest[node] < float('infinity')]
+        if not candidates:
+            break
+        landmark = max(candidates, key=lambda node: closest[node])
+        landmarks.append(landmark)
+        distances = dijkstra(graph, landmark, trace='off', weight_range=weight_range)[0]
+        for node in nodes:
+            closest[node] = min(closest[node], distances[node])
+
+    return landmarks
+
+class LandmarkHeuristic:
+
+    # Эвристика ALT (A*, landmarks, triangle inequality). Таблицы расстояний
+    # от ориентиров и до ориентиров считаются один раз алгоритмом Дейкстры,
+    # после чего объект используется как heuristic(node, target) в a_star()
+
+    def __init__(self, graph, landmarks, reverse=None):
+        if reverse is None:
+            reverse = reverse_graph(graph)
+        self.landmarks = list(landmarks)
+
+        inf = float('infinity')
+        # У обратного графа те же веса - диапазон считается один раз
+        weight_range = _weight_range(graph)
+        from_landmarks = [dijkstra(graph, landmark, trace='off', weight_range=weight_range)[0]
+                          for landmark in self.landmarks]
+        to_landmarks = [dijkstra(reverse, landmark, trace='off', weight_range=weight_range)[0]
+                        for landmark in self.landmarks]
+
+        # Для каждой вершины - кортеж расстояний по всем ориентирам
+        self.forward = {node: tuple(table.get(node, inf) for table in from_landmarks) for node in graph}
+        self.backward = {node: tuple(table.get(node, inf) for table in to_landmarks) for node in graph}
+
+    def __call__(self, node, target):
+        inf = float('infinity')
+        best = 0
+        # d(v, t) >= d(L, t) - d(L, v) и d(v, t) >= d(v, L) - d(t, L)
+        for from_v, from_t in zip(self.forward[node], self.forward[target]):
+            if from_v < inf and from_t < inf and from_t - from_v > best:
+                best = from_t - from_v
+        for to_v, to_t in zip(self.backward[node], self.backward[target]):
+            if to_v < inf and to_t < inf and to_v - to_t > best:
+                best = to_v - to_t
+        return best
+
+def a_star(graph, start_node, target_node, heuristic=None):
+
+    # A* от start_node до target_node. heuristic(node, target) должна быть допустимой
+    # (не больше истинного расстояния), тогда найденный путь кратчайший.
+    # Без эвристики поиск совпадает с shortest_path().
+    # Возвращает (длина, путь, число раскрытых вершин)
+    if heuristic is None:
+        heuristic = lambda node, target: 0
+
+    edges = _edges_of(graph)
+    start = _node_id(graph, start_node)
+    target = _node_id(graph, target_node)
+    names = graph.nodes if isinstance(graph, CSRGraph) else None
+
+    def estimate(u):
+        return heuristic(names[u] if names is not None else u, target_node)
+
+    distances = {start: 0}
+    previous = {start: None}
+    priority_queue = [(estimate(start), 0, start)]
+    expanded = 0
+
+    while priority_queue:
+        _, current_distance, u = heapq.heappop(priority_queue)
+
+        # Устаревшая запись: вершина уже раскрыта с меньшим расстоянием.
+        # Повторное раскрытие разрешено, поэтому достаточно и несогласованной эвристики
+        if current_distance > distances[u]:
+            continue
+        expanded += 1
+
+        if u == target:
+            path = reconstruct_path(previous, target)
+            return current_distance, _node_names(graph, path), expanded
+
+        for v, weight in edges(u):
+            distance = current_distance + weight
+            if distance < distances.get(v, float('infinity')):
+                distances[v] = distance
+                previous[v] = u
+                heapq.heappush(priority_queue, (distance + estimate(v), distance, v))
+
+    return float('infinity'), [], expanded
+
+# Состояние процесса-воркера в johnson_all_pairs(): массивы графа и матрица
+# результатов в общей памяти, подключаются один раз в инициализаторе пула
+_johnson_worker = {}
+
+def _attach_johnson_arrays(names, n, m):
+
+    _bind_johnson_arrays([shared_memory.SharedMemory(name=name) for name in names], n, m)
+
+def _bind_johnson_arrays(blocks, n, m):
+
+    _johnson_worker['blocks'] = blocks
+    _johnson_worker['n'] = n
+    _johnson_worker['offsets'] = blocks[0].buf[:8 * (n + 1)].cast('q')
+    _johnson_worker['targets'] = blocks[1].buf[:8 * m].cast('q')
+    _johnson_worker['weights'] = blocks[2].buf[:8 * m].cast('d')
+    _johnson_worker['matrix'] = blocks[3].buf[:8 * n * n].cast('d')
+
+def _dijkstra_rows(sources):
+
+    # Дейкстра по массивам CSR для пачки источников, строки пишутся прямо в общую матрицу
+    n = _johnson_worker['n']
+    offsets = _johnson_worker['offsets']
+    targets = _johnson_worker['targets']
+    weights = _johnson_worker['weights']
+    matrix = _johnson_worker['matrix']
+    inf = float('infinity')
+
+    for source in sources:
+        distances = [inf] * n
+        distances[source] = 0.0
+        priority_queue = [(0.0, source)]
+        while priority_queue:
+            current_distance, u = heapq.heappop(priority_queue)
+            if current_distance > distances[u]:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                distance = current_distance + weights[e]
+                if distance < distances[v]:
+                    distances[v] = distance
+                    heapq.heappush(priority_queue, (distance, v))
+        matrix[source * n:(source + 1) * n] = array('d', distances)
+
+    return len(sources)
+
+def johnson_all_pairs(graph, workers=None, chunk_size=None):
+
+    # Кратчайшие расстояния между всеми парами вершин методом Джонсона:
+    # один запуск bellman_ford() от фиктивной вершины даёт потенциалы h,
+    # веса w + h(u) - h(v) неотрицательны, и от каждого источника запускается
+    # Дейкстра в пуле процессов. Граф и матрица лежат в общей памяти,
+    # поэтому в задачи передаются только номера источников.
+    # Возвращает (список вершин, матрица numpy n x n)
+    csr = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+    nodes = list(csr.nodes)
+    n = len(nodes)
+    m = csr.num_edges
+    offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+    targets = np.frombuffer(csr.targets, dtype=np.int64)
+    weights = np.frombuffer(csr.weights, dtype=csr.weight_typecode).astype(np.float64)
+
+    # Фиктивная вершина с рёбрами веса 0 во все вершины
+    source = object()
+    augmented = CSRGraph(array('q', list(csr.offsets) + [m + n]),
+                         array('q', list(csr.targets) + list(range(n))),
+                         array('d', weights.tolist() + [0.0] * n),
+                         nodes + [source])
+    potentials, _, _, has_negative_cycle = bellman_ford(augmented, source, trace='off')
+    if has_negative_cycle:
+        raise ValueError("Граф содержит отрицательный цикл, кратчайшие пути не определены")
+
+    h = np.array([potentials[node] for node in nodes], dtype=np.float64)
+    sources_of_edges = np.repeat(np.arange(n), np.diff(offsets))
+    # Погрешность округления не должна давать отрицательных весов
+    reweighted = np.maximum(weights + h[sources_of_edges] - h[targets], 0.0)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, n // (4 * workers))
+
+    arrays = [offsets, targets, reweighted]
+    blocks = []
+    try:
+        for data in arrays + [None]:
+            size = data.nbytes if data is not None else 8 * n * n
+            block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            blocks.append(block)
+            if data is not None:
+                np.ndarray(data.shape, dtype=data.dtype, buffer=block.buf)[:] = data
+        names = [block.name for block in blocks]
+
+        batches = [range(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+        if workers == 1:
+            _bind_johnson_arrays(blocks, n, m)
+            try:
+                for batch in batches:
+                    _dijkstra_rows(batch)
+            finally:
+                _johnson_worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_johnson_arrays,
+                                     initargs=(names, n, m)) as pool:
+                for _ in pool.map(_dijkstra_rows, batches):
+                    pass
+
+        matrix = np.ndarray((n, n), dtype=np.float64, buffer=blocks[3].buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    # Обратный переход от перевзвешенных расстояний: d(u, v) = d'(u, v) - h(u) + h(v)
+    matrix += h[np.newaxis, :] - h[:, np.newaxis]
+    return nodes, matrix
+
+class DynamicShortestPathTree:
+
+    # Дерево кратчайших путей от start_node, которое поддерживается при изменении
+    # весов рёбер (в духе Ramalingam-Reps). При увеличении веса или удалении ребра
+    # дерева пересчитывается только поддерево его конца, при уменьшении или вставке
+    # ребра улучшения распространяются от его конца. Веса неотрицательные.
+
+    def __init__(self, graph, start_node, distances=None, previous_nodes=None):
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_dict()
+        # Собственная копия графа, чтобы изменения не затрагивали исходный словарь
+        self.graph = {node: dict(neighbors) for node, neighbors in graph.items()}
+        self.reverse = reverse_graph(self.graph)
+        for node in self.reverse:
+            self.graph.setdefault(node, {})
+        self.start_node = start_node
+        # Границы весов для make_queue(): при изменениях только расширяются,
+        # поэтому остаются верными без повторного просмотра всех рёбер
+        self.weight_range = _weight_range(self.graph)
+
+        if distances is None or previous_nodes is None:
+            distances, previous_nodes, _ = dijkstra(self.graph, start_node, trace='off',
+                                                    weight_range=self.weight_range)
+        self.distances = dict(distances)
+        self.previous_nodes = dict(previous_nodes)
+
+        self.children = {node: set() for node in self.graph}
+        for node, parent in self.previous_nodes.items():
+            if parent is not None:
+                self.children[parent].add(node)
+
+    def _add_node(self, node):
+        if node not in self.graph:
+            self.graph[node] = {}
+            self.reverse[node] = {}
+            self.distances[node] = float('infinity')
+            self.previous_nodes[node] = None
+            self.children[node] = set()
+
+    def _set_parent(self, node, parent):
+        old_parent = self.previous_nodes[node]
+        if old_parent is not None:
+            self.children[old_parent].discard(node)
+        self.previous_nodes[node] = parent
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def update_edge(self, u, v, weight):
+        # Вставка ребра или изменение его веса
+        return self.apply([(u, v, weight)])
+
+    def remove_edge(self, u, v):
+        return self.apply([(u, v, None)])
+
+    def apply(self, events):
+        # events: последовательность (u, v, вес), вес None означает удаление ребра.
+        # Все события пачки обрабатываются одним проходом восстановления.
+        # Возвращает число вершин, расстояние до которых пересчитывалось
+        inf = float('infinity')
+        affected_roots = []
+        decreased = []
+
+        for u, v, weight in events:
+            self._add_node(u)
+            self._add_node(v)
+            old_weight = self.graph[u].get(v, inf)
+            if weight is None:
+                self.graph[u].pop(v, None)
+                self.reverse[v].pop(u, None)
+                weight = inf
+            else:
+                self.graph[u][v] = weight
+                self.reverse[v][u] = weight
+                all_int, low, high = self.weight_range
+                self.weight_range = (all_int and isinstance(weight, int), min(low, weight), max(high, weight))
+
+            if weight > old_weight and self.previous_nodes[v] == u:
+                affected_roots.append(v)
+            elif weight < old_weight:
+                decreased.append((u, v))
+
+        # Поддеревья, которые держались на подорожавших рёбрах дерева
+        affected = set()
+        stack = [node for node in affected_roots if node != self.start_node]
+        while stack:
+            node = stack.pop()
+            if node in affected:
+                continue
+            affected.add(node)
+            stack.extend(self.children[node])
+
+        for node in affected:
+            self._set_parent(node, None)
+            self.distances[node] = inf
+
+        priority_queue = []
+
+        # Лучшее входящее ребро из незатронутой части дерева
+        for node in affected:
+            for parent, weight in self.reverse[node].items():
+                if parent not in affected and self.distances[parent] + weight < self.distances[node]:
+                    self.distances[node] = self.distances[parent] + weight
+                    self._set_parent(node, parent)
+            if self.distances[node] < inf:
+                heapq.heappush(priority_queue, (self.distances[node], node))
+
+        for u, v in decreased:
+            weight = self.graph[u].get(v)
+            if weight is not None and self.distances[u] + weight < self.distances[v]:
+                self.distances[v] = self.distances[u] + weight
+                self._set_parent(v, u)
+                heapq.heappush(priority_queue, (self.distances[v], v))
+
+        # Дейкстра только по вершинам, чьи расстояния изменились
+        touched = set(affected)
+        while priority_queue:
+            current_distance, node = heapq.heappop(priority_queue)
+            if current_distance > self.distances[node]:
+                continue
+            touched.add(node)
+            for neighbor, weight in self.graph[node].items():
+                distance = current_distance + weight
+                if distance < self.distances[neighbor]:
+                    self.distances[neighbor] = distance
+                    self._set_parent(neighbor, node)
+                    heapq.heappush(priority_queue, (distance, neighbor))
+
+        return len(touched)
+
+    def path(self, target_node):
+        if self.distances.get(target_node, float('infinity')) == float('infinity'):
+            return []
+        return reconstruct_path(self.previous_nodes, target_node)
+
+def random_graph(n, m, max_weight=100, seed=None):
+
+    # Случайный ориентированный граф из n вершин и примерно m рёбер с целыми весами
+    rng = random.Random(seed)
+    graph = {node: {} for node in range(n)}
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            graph[u][v] = rng.randint(1, max_weight)
+    return graph
+
+def grid_graph(rows, cols, max_weight=10, seed=None):
+
+    # Решётка rows x cols с рёбрами в обе стороны между соседями, похожа на дорожную сеть
+    rng = random.Random(seed)
+    graph = {(r, c): {} for r in range(rows) for c in range(cols)}
+    for r in range(rows):
+        for c in range(cols):
+            for nr, nc in ((r + 1, c), (r, c + 1)):
+                if nr < rows and nc < cols:
+                    weight = rng.randint(1, max_weight)
+                    graph[(r, c)][(nr, nc)] = weight
+                    graph[(nr, nc)][(r, c)] = weight
+    return graph
+
+def random_geometric_graph(n, degree=8, seed=None):
+
+    # n случайных точек в единичном квадрате, рёбра в обе стороны между точками
+    # ближе радиуса r (в среднем degree соседей), вес - евклидово расстояние.
+    # Возвращает (граф, координаты) - координаты пригодны для euclidean_heuristic()
+    rng = random.Random(seed)
+    coordinates = {node: (rng.random(), rng.random()) for node in range(n)}
+    radius = math.sqrt(degree / (math.pi * max(n, 1)))
+
+    # Сетка ячеек со стороной radius: соседей ищем только в смежных ячейках
+    cells = defaultdict(list)
+    for node, (x, y) in coordinates.items():
+        cells[(int(x / radius), int(y / radius))].append(node)
+
+    graph = {node: {} for node in range(n)}
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for u in members:
+                    for v in cells.get((cx + dx, cy + dy), ()):
+                        if u < v:
+                            distance = math.dist(coordinates[u], coordinates[v])
+                            if distance <= radius:
+                                graph[u][v] = graph[v][u] = distance
+    return graph, coordinates
+
+def scale_free_graph(n, attachments=3, max_weight=100, seed=None):
+
+    # Модель Барабаши-Альберт: каждая новая вершина соединяется (в обе стороны)
+    # с attachments вершинами, выбранными пропорционально их степени
+    rng = random.Random(seed)
+    graph = {node: {} for node in range(n)}
+    # Каждая вершина входит в список столько раз, какова её степень
+    endpoints = list(range(min(n, attachments + 1)))
+    for u in range(len(endpoints)):
+        for v in range(u + 1, len(endpoints)):
+            graph[u][v] = graph[v][u] = rng.randint(1, max_weight)
+
+    for node in range(len(endpoints), n):
+        targets = set()
+        while len(targets) < attachments:
+            targets.add(rng.choice(endpoints))
+        for target in targets:
+            graph[node][target] = graph[target][node] = rng.randint(1, max_weight)
+            endpoints.extend((node, target))
+    return graph
+
+def negative_dag(n, m, low=-20, high=100, seed=None):
+
+    # Ациклический граф (рёбра только от меньшего номера к большему) с отрицательными
+    # весами: отрицательных циклов нет, подходит для bellman_ford() и spfa()
+    rng = random.Random(seed)
+    graph = {node: {} for node in range(n)}
+    # Цепочка 0 -> 1 -> ... делает все вершины достижимыми из 0
+    for node in range(n - 1):
+        graph[node][node + 1] = rng.randint(low, high)
+    for _ in range(max(0, m - (n - 1))):
+        u, v = sorted(rng.sample(range(n), 2))
+        graph[u][v] = rng.randint(low, high)
+    return graph
+
+def benchmark_dynamic_updates(n=20000, m=100000, batch_sizes=(1, 5, 20, 100), rounds=20, seed=0):
+
+    # Сравнение восстановления дерева после пачки изменений весов с полным пересчётом dijkstra()
+    rng = random.Random(seed)
+    graph = random_graph(n, m, seed=seed)
+    tree = DynamicShortestPathTree(graph, 0)
+    edges = [(u, v) for u in tree.graph for v in tree.graph[u]]
+
+    print(f"\nГраф: {n} вершин, {len(edges)} рёбер, {rounds} пачек на каждый размер")
+    print(f"{'Пачка':>8} {'Пересчёт, мс':>14} {'Инкремент, мс':>15} {'Ускорение':>10} {'Вершин':>8}")
+
+    results = []
+    for batch_size in batch_sizes:
+        full_time = incremental_time = 0.0
+        touched = 0
+        for _ in range(rounds):
+            events = []
+            for u, v in rng.sample(edges, batch_size):
+                weight = tree.graph[u].get(v)
+                if weight is None:
+                    events.append((u, v, rng.randint(1, 100)))
+                else:
+                    roll = rng.random()
+                    events.append((u, v, None if roll < 0.1 else max(1, int(weight * (0.5 + roll)))))
+
+            start = time.perf_counter()
+            touched += tree.apply(events)
+            incremental_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected, _, _ = dijkstra(tree.graph, 0, trace='off', weight_range=tree.weight_range)
+            full_time += time.perf_counter() - start
+
+            if expected != tree.distances:
+                raise AssertionError("Инкрементальный результат расходится с полным пересчётом")
+
+        speedup = full_time / incremental_time if incremental_time else float('infinity')
+        print(f"{batch_size:>8} {full_time / rounds * 1e3:>14.2f} {incremental_time / rounds * 1e3:>15.3f} "
+              f"{speedup:>9.1f}x {touched // rounds:>8}")
+        results.append({'batch_size': batch_size, 'full_ms': full_time / rounds * 1e3,
+                        'incremental_ms': incremental_time / rounds * 1e3, 'speedup': speedup})
+    return results
+
+class ContractionHierarchy:
+
+    # Иерархия сжатия (contraction hierarchy) для многократных запросов к статическому
+    # графу. Вершины сжимаются по возрастанию приоритета (edge difference), вместо
+    # удаляемой вершины добавляются рёбра-шорткаты, если нет пути-свидетеля не длиннее.
+    # Запрос - двунаправленный Дейкстра только по рёбрам "вверх" по рангу.
+    # Рёбра хранятся в CSR-списках: forward - рёбра u -> v с rank[u] < rank[v],
+    # backward - рёбра u -> v с rank[u] > rank[v], записанные у вершины v.
+    # middles[e] - сжатая вершина шортката или -1 для исходного ребра
+
+    def __init__(self, nodes, rank, forward, backward):
+        self.nodes = list(nodes)
+        self.index = {name: i for i, name in enumerate(self.nodes)}
+        self.rank = rank
+        self.forward = forward
+        self.backward = backward
+        self.stats = {}
+
+    @classmethod
+    def build(cls, graph, witness_limit=60):
+        started = time.perf_counter()
+        csr = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+        n = len(csr)
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+        # Оставшийся граф: out[u][v] = (вес, middle), inc[v][u] - то же в обратную сторону
+        out = [{} for _ in range(n)]
+        inc = [{} for _ in range(n)]
+        original_edges = 0
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v, weight = targets[e], weights[e]
+                if u != v and (v not in out[u] or weight < out[u][v][0]):
+                    out[u][v] = inc[v][u] = (weight, -1)
+                    original_edges += 1
+
+        inf = float('infinity')
+
+        def witness_distances(source, excluded, max_distance):
+            # Ограниченный Дейкстра в оставшемся графе без вершины excluded
+            distances = {source: 0}
+            priority_queue = [(0, source)]
+            settled = 0
+            while priority_queue:
+                current_distance, x = heapq.heappop(priority_queue)
+                if current_distance > distances[x]:
+                    continue
+                if current_distance > max_distance or settled >= witness_limit:
+                    break
+                settled += 1
+                for y, (weight, _) in out[x].items():
+                    distance = current_distance + weight
+                    if y != excluded and distance < distances.get(y, inf):
+                        distances[y] = distance
+                        heapq.heappush(priority_queue, (distance, y))
+            return distances
+
+        def shortcuts_for(v):
+            shortcuts = []
+            if not out[v]:
+                return shortcuts
+            longest_out = max(weight for weight, _ in out[v].values())
+            for u, (weight_in, _) in inc[v].items():
+                distances = witness_distances(u, v, weight_in + longest_out)
+                for w, (weight_out, _) in out[v].items():
+                    if w != u and weight_in + weight_out < distances.get(w, inf):
+                        shortcuts.append((u, w, weight_in + weight_out))
+            return shortcuts
+
+        deleted_neighbors = [0] * n
+
+        def priority(v):
+            return len(shortcuts_for(v)) - len(inc[v]) - len(out[v]) + deleted_neighbors[v]
+
+        order_queue = [(priority(v), v) for v in range(n)]
+        heapq.heapify(order_queue)
+        rank = [0] * n
+        up_out = [None] * n
+        up_in = [None] * n
+        shortcut_count = 0
+
+        for level in range(n):
+            # Ленивое обновление: приоритет пересчитывается при извлечении
+            while True:
+                _, v = heapq.heappop(order_queue)
+                current = priority(v)
+                if not order_queue or current <= order_queue[0][0]:
+                    break
+                heapq.heappush(order_queue, (current, v))
+
+            rank[v] = level
+            shortcuts = shortcuts_for(v)
+            up_out[v] = [(w, weight, middle) for w, (weight, middle) in out[v].items()]
+            up_in[v] = [(u, weight, middle) for u, (weight, middle) in inc[v].items()]
+
+            for w in out[v]:
+                del inc[w][v]
+                deleted_neighbors[w] += 1
+            for u in inc[v]:
+                del out[u][v]
+                deleted_neighbors[u] += 1
+            out[v] = {}
+            inc[v] = {}
+
+            for u, w, weight in shortcuts:
+                if w not in out[u] or weight < out[u][w][0]:
+                    if w not in out[u]:
+                        shortcut_count += 1
+                    out[u][w] = inc[w][u] = (weight, v)
+
+        def flatten(lists):
+            csr_offsets, csr_targets, csr_weights, csr_middles = [0], [], [], []
+            for edges in lists:
+                for target, weight, middle in edges:
+                    csr_targets.append(target)
+                    csr_weights.append(weight)
+                    csr_middles.append(middle)
+                csr_offsets.append(len(csr_targets))
+            return csr_offsets, csr_targets, csr_weights, csr_middles
+
+        hierarchy = cls(csr.nodes, rank, flatten(up_out), flatten(up_in))
+        hierarchy.stats = {
+            'nodes': n,
+            'edges': original_edges,
+            'shortcuts': shortcut_count,
+            'build_seconds': time.perf_counter() - started,
+            'index_bytes': hierarchy.index_bytes(),
+        }
+        return hierarchy
+
+    def index_bytes(self):
+        # Размер индекса при хранении массивов по 8 байт на элемент
+        return 8 * (len(self.rank) + sum(len(part) for part in self.forward + self.backward))
+
+    def save(self, path):
+        arrays = {'rank': np.array(self.rank, dtype=np.int64),
+                  'nodes': np.array(json.dumps(self.nodes))}
+        for prefix, parts in (('forward', self.forward), ('backward', self.backward)):
+            for name, values in zip(('offsets', 'targets', 'weights', 'middles'), parts):
+                arrays[f'{prefix}_{name}'] = np.array(values, dtype=None if name == 'weights' else np.int64)
+        with open(path, 'wb') as file:
+            np.savez(file, **arrays)
+        self.stats['file_bytes'] = os.path.getsize(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            parts = {prefix: tuple(data[f'{prefix}_{name}'].tolist()
+                                   for name in ('offsets', 'targets', 'weights', 'middles'))
+                     for prefix in ('forward', 'backward')}
+            # Имена вершин хранятся в JSON: строки, числа и кортежи (например, клетки решётки)
+            nodes = [tuple(name) if isinstance(name, list) else name
+                     for name in json.loads(str(data['nodes']))]
+            hierarchy = cls(nodes, data['rank'].tolist(), parts['forward'], parts['backward'])
+        hierarchy.stats['file_bytes'] = os.path.getsize(path)
+        return hierarchy
+
+    def _middle(self, u, v):
+        # Сжатая вершина ребра u -> v (-1 для исходного ребра)
+        if self.rank[u] < self.rank[v]:
+            offsets, targets, _, middles = self.forward
+            owner, other = u, v
+        else:
+            offsets, targets, _, middles = self.backward
+            owner, other = v, u
+        for e in range(offsets[owner], offsets[owner + 1]):
+            if targets[e] == other:
+                return middles[e]
+        raise KeyError((u, v))
+
+    def _unpack(self, u, v, middle, path):
+        # Разворачивание шортката u -> v в исходные рёбра, к path добавляются вершины после u
+        stack = [(u, v, middle)]
+        while stack:
+            a, b, middle = stack.pop()
+            if middle < 0:
+                path.append(b)
+            else:
+                stack.append((middle, b, self._middle(middle, b)))
+                stack.append((a, middle, self._middle(a, middle)))
+
+    def query(self, start_node, target_node):
+        # Кратчайшее расстояние и путь между двумя вершинами
+        inf = float('infinity')
+        start, target = self.index[start_node], self.index[target_node]
+        if start == target:
+            return 0, [start_node]
+
+        graphs = (self.forward, self.backward)
+        distances = ({start: 0}, {target: 0})
+        previous = ({start: None}, {target: None})
+        queues = ([(0, start)], [(0, target)])
+        best = inf
+        meeting_node = None
+
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                # Направление заканчивается, когда его минимум не меньше лучшего пути
+                if queue[0][0] >= best:
+                    queue.clear()
+                    continue
+                current_distance, u = heapq.heappop(queue)
+                if current_distance > distances[side][u]:
+                    continue
+                if u in distances[1 - side] and current_distance + distances[1 - side][u] < best:
+                    best = current_distance + distances[1 - side][u]
+                    meeting_node = u
+
+                offsets, targets, weights, middles = graphs[side]
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    distance = current_distance + weights[e]
+                    if distance < distances[side].get(v, inf):
+                        distances[side][v] = distance
+                        previous[side][v] = (u, middles[e])
+                        heapq.heappush(queue, (distance, v))
+
+        if meeting_node is None:
+            return inf, []
+
+        # Прямая часть: цепочка предшественников от встречи к началу
+        chain = []
+        node = meeting_node
+        while previous[0][node] is not None:
+            parent, middle = previous[0][node]
+            chain.append((parent, node, middle))
+            node = parent
+        path = [start]
+        for u, v, middle in reversed(chain):
+            self._unpack(u, v, middle, path)
+
+        # Обратная часть: ссылки previous[1] ведут от встречи к концу
+        node = meeting_node
+        while previous[1][node] is not None:
+            child, middle = previous[1][node]
+            self._unpack(node, child, middle, path)
+            node = child
+
+        return best, [self.nodes[i] for i in path]
+
+    def distance(self, start_node, target_node):
+        return self.query(start_node, target_node)[0]
+
+def benchmark_contraction_hierarchy(graph=None, queries=500, path='ch_index.npz', seed=0):
+
+    # Время предобработки, размер индекса и задержка запроса в сравнении с dijkstra()
+    if graph is None:
+        graph = grid_graph(70, 70, seed=seed)
+    rng = random.Random(seed)
+
+    built = ContractionHierarchy.build(graph)
+    built.save(path)
+    hierarchy = ContractionHierarchy.load(path)
+    stats = {**built.stats, 'file_bytes': hierarchy.stats['file_bytes']}
+
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    sources = sorted(set(source for source, _ in pairs[:50]))
+    reference = {source: dijkstra(graph, source, trace='off')[0] for source in sources}
+
+    for source, target in pairs:
+        if source in reference:
+            length, route = hierarchy.query(source, target)
+            if length != reference[source][target]:
+                raise AssertionError(f"CH и dijkstra() расходятся для {source} -> {target}")
+            if route and sum(graph[u][v] for u, v in zip(route, route[1:])) != length:
+                raise AssertionError(f"Некорректный путь CH для {source} -> {target}")
+
+    started = time.perf_counter()
+    for source, target in pairs:
+        hierarchy.query(source, target)
+    ch_latency = (time.perf_counter() - started) / queries
+
+    started = time.perf_counter()
+    for source, target in pairs[:50]:
+        shortest_path(graph, source, target)
+    dijkstra_latency = (time.perf_counter() - started) / min(queries, 50)
+
+    print(f"\nГраф: {len(nodes)} вершин; проверено запросов против dijkstra(): "
+          f"{sum(source in reference for source, _ in pairs)}")
+    print(f"Предобработка: {stats['build_seconds']:.2f} с")
+    print(f"Шорткатов: {stats['shortcuts']}, индекс: {stats['index_bytes'] / 1024:.1f} КиБ, "
+          f"файл: {stats['file_bytes'] / 1024:.1f} КиБ")
+    print(f"Запрос CH: {ch_latency * 1e6:.1f} мкс, Дейкстра с ранним остановом: {dijkstra_latency * 1e6:.1f} мкс")
+    return {'ch_query_us': ch_latency * 1e6, 'dijkstra_query_us': dijkstra_latency * 1e6, **stats}
+
+# Двоичный формат графа на диске (little-endian): заголовок _GRAPH_HEADER,
+# с байта _GRAPH_DATA_OFFSET - offsets int64[n + 1], targets int64[m],
+# weights int64/float64[m], затем (необязательно) имена вершин в JSON.
+# Без имён вершины называются числами node_base, node_base + 1, ...
+GRAPH_FILE_MAGIC = b'CSRGRAPH'
+_GRAPH_HEADER = struct.Struct('<8sIcxxxQQQQqdd')
+_GRAPH_DATA_OFFSET = 128
+# Временная запись ребра при потоковой конвертации
+_EDGE_RECORD = np.dtype([('u', '<i8'), ('v', '<i8'), ('w', '<f8')])
+
+def _write_graph_header(file, typecode, n, m, names_offset, names_length, node_base, low, high):
+
+    file.seek(0)
+    header = _GRAPH_HEADER.pack(GRAPH_FILE_MAGIC, 1, typecode.encode(), n, m,
+                                names_offset, names_length, node_base, low, high)
+    file.write(header.ljust(_GRAPH_DATA_OFFSET, b'\0'))
+
+def save_graph(graph, path):
+
+    # Запись словаря или CSRGraph в двоичный формат для open_graph()
+    csr = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+    all_int, low, high = _weight_range(csr)
+    n, m = len(csr), csr.num_edges
+
+    with open(path, 'wb') as file:
+        file.write(bytes(_GRAPH_DATA_OFFSET))
+        for values, typecode in ((csr.offsets, 'q'), (csr.targets, 'q'), (csr.weights, csr.weight_typecode)):
+            file.write(memoryview(values).cast('B') if not isinstance(values, array)
+                       else values.tobytes())
+        names_offset = file.tell()
+        if isinstance(csr.nodes, range) and csr.nodes.step == 1:
+            names_length, node_base = 0, csr.nodes.start
+        else:
+            file.write(json.dumps(list(csr.nodes)).encode())
+            names_length, node_base = file.tell() - names_offset, 0
+        _write_graph_header(file, csr.weight_typecode, n, m, names_offset, names_length,
+                            node_base, low, high)
+
+def open_graph(path):
+
+    # Граф из файла save_graph()/convert_*() без загрузки в память: массивы CSR -
+    # это memoryview поверх mmap, страницы подгружаются ОС по мере обращения
+    with open(path, 'rb') as file:
+        storage = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, _, typecode, n, m, names_offset, names_length,
+     node_base, low, high) = _GRAPH_HEADER.unpack_from(storage, 0)
+    if magic != GRAPH_FILE_MAGIC:
+        storage.close()
+        raise ValueError(f"{path}: не файл графа (нет сигнатуры {GRAPH_FILE_MAGIC!r})")
+    typecode = typecode.decode()
+
+    view = memoryview(storage)
+    start = _GRAPH_DATA_OFFSET
+    offsets = view[start:start + 8 * (n + 1)].cast('q')
+    start += 8 * (n + 1)
+    targets = view[start:start + 8 * m].cast('q')
+    start += 8 * m
+    weights = view[start:start + 8 * m].cast(typecode)
+
+    if names_length:
+        nodes = [tuple(name) if isinstance(name, list) else name
+                 for name in json.loads(bytes(view[names_offset:names_offset + names_length]))]
+    else:
+        nodes = range(node_base, node_base + n)
+
+    graph = CSRGraph(offsets, targets, weights, nodes)
+    if typecode == 'q':
+        low, high = int(low), int(high)
+    graph.weight_range = (typecode == 'q', low, high)
+    # Ссылка на mmap держит отображение открытым, пока жив граф
+    graph.storage = storage
+    return graph
+
+def _convert_edge_chunks(chunks, output_path, node_count=0, names=None, node_base=0):
+
+    # Потоковая сборка CSR-файла. chunks - итератор пачек (u, v, w, все веса целые)
+    # с индексами вершин от 0. Проход 1: пачки пишутся во временный файл и считаются
+    # степени вершин. Проход 2: рёбра раскладываются по позициям через numpy.memmap.
+    # В памяти держатся только массивы длины n и одна пачка рёбер
+    temp_path = output_path + '.edges.tmp'
+    degrees = np.zeros(node_count, dtype=np.int64)
+    all_int = True
+    m = 0
+    low, high = float('infinity'), -float('infinity')
+
+    try:
+        with open(temp_path, 'wb') as temp:
+            for sources, targets, weights, chunk_all_int in chunks:
+                records = np.empty(len(sources), dtype=_EDGE_RECORD)
+                records['u'], records['v'], records['w'] = sources, targets, weights
+                if not len(records):
+                    continue
+                needed = int(max(records['u'].max(), records['v'].max())) + 1
+                if needed > len(degrees):
+                    degrees = np.concatenate([degrees, np.zeros(needed - len(degrees), dtype=np.int64)])
+                degrees += np.bincount(records['u'], minlength=len(degrees))
+                all_int = all_int and chunk_all_int
+                low = min(low, float(records['w'].min()))
+                high = max(high, float(records['w'].max()))
+                m += len(records)
+                records.tofile(temp)
+
+        n = len(degrees)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        typecode = 'q' if all_int else 'd'
+
+        with open(output_path, 'wb') as file:
+            file.write(bytes(_GRAPH_DATA_OFFSET))
+            file.write(offsets.tobytes())
+            file.truncate(_GRAPH_DATA_OFFSET + 8 * (n + 1) + 16 * m)
+
+        if m:
+            data_start = _GRAPH_DATA_OFFSET + 8 * (n + 1)
+            out_targets = np.memmap(output_path, dtype='<i8', mode='r+', offset=data_start, shape=(m,))
+            out_weights = np.memmap(output_path, dtype='<' + ('i8' if all_int else 'f8'), mode='r+',
+                                    offset=data_start + 8 * m, shape=(m,))
+            edges = np.memmap(temp_path, dtype=_EDGE_RECORD, mode='r')
+            cursor = offsets[:-1].copy()
+            chunk_edges = 1 << 20
+            for start in range(0, m, chunk_edges):
+                part = edges[start:start + chunk_edges]
+                # Устойчивая сортировка сохраняет исходный порядок рёбер каждой вершины
+                order = np.argsort(part['u'], kind='stable')
+                sources = part['u'][order]
+                group_start = np.searchsorted(sources, sources, side='left')
+                positions = cursor[sources] + (np.arange(len(sources)) - group_start)
+                out_targets[positions] = part['v'][order]
+                out_weights[positions] = part['w'][order]
+                cursor += np.bincount(part['u'], minlength=n)
+            out_targets.flush()
+            out_weights.flush()
+            del out_targets, out_weights, edges
+        else:
+            low = high = 0
+
+        with open(output_path, 'r+b') as file:
+            file.seek(0, os.SEEK_END)
+            names_offset = file.tell()
+            if names is not None:
+                file.write(json.dumps(names).encode())
+            names_length = file.tell() - names_offset
+            _write_graph_header(file, typecode, n, m, names_offset, names_length, node_base, low, high)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _number(token):
+
+    try:
+        return int(token), True
+    except ValueError:
+        return float(token), False
+
+def convert_dimacs(source_path, output_path, chunk_edges=1 << 20):
+
+    # DIMACS .gr ("p sp n m", "a u v w", вершины с 1) -> двоичный файл графа.
+    # Вершины называются своими номерами 1..n
+    node_count = 0
+    with open(source_path) as file:
+        for line in file:
+            if line.startswith('p'):
+                node_count = int(line.split()[2])
+                break
+            if line.startswith('a'):
+                break
+
+    def chunks():
+        sources, targets, weights = [], [], []
+        all_int = True
+        with open(source_path) as file:
+            for line in file:
+                if not line.startswith('a'):
+                    continue
+                _, u, v, w = line.split()
+                weight, is_int = _number(w)
+                sources.append(int(u) - 1)
+                targets.append(int(v) - 1)
+                weights.append(weight)
+                all_int = all_int and is_int
+                if len(sources) >= chunk_edges:
+                    yield sources, targets, weights, all_int
+                    sources, targets, weights = [], [], []
+                    all_int = True
+        yield sources, targets, weights, all_int
+
+    _convert_edge_chunks(chunks(), output_path, node_count=node_count, node_base=1)
+
+def convert_edge_list(source_path, output_path, chunk_edges=1 << 20, default_weight=1):
+
+    # Текстовый список рёбер "u v [w]" (строки с # пропускаются) -> двоичный файл графа.
+    # Имена вершин - строки из файла, индексы назначаются в порядке появления
+    index = {}
+    names = []
+
+    def node(token):
+        i = index.get(token)
+        if i is None:
+            i = index[token] = len(names)
+            names.append(token)
+        return i
+
+    def chunks():
+        sources, targets, weights = [], [], []
+        all_int = True
+        with open(source_path) as file:
+            for line in file:
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+                sources.append(node(parts[0]))
+                targets.append(node(parts[1]))
+                if len(parts) > 2:
+                    weight, is_int = _number(parts[2])
+                    all_int = all_int and is_int
+                else:
+                    weight = default_weight
+                weights.append(weight)
+                if len(sources) >= chunk_edges:
+                    yield sources, targets, weights, all_int
+                    sources, targets, weights = [], [], []
+                    all_int = True
+        yield sources, targets, weights, all_int
+
+    _convert_edge_chunks(chunks(), output_path, names=names)
+
+def load_graph(source_path, cache_path=None):
+
+    # Открытие графа из .gr (DIMACS) или списка рёбер с кешем в двоичном формате:
+    # первый запуск конвертирует файл, повторные сразу открывают кеш через mmap
+    if cache_path is None:
+        cache_path = source_path + '.csr'
+    if not (os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path)):
+        if source_path.endswith('.gr'):
+            convert_dimacs(source_path, cache_path)
+        else:
+            convert_edge_list(source_path, cache_path)
+    return open_graph(cache_path)
+
+# Семейства графов для run_benchmarks(): размер задаётся числом рёбер
+BENCHMARK_FAMILIES = {
+    'grid': lambda edges, seed: grid_graph(max(2, int(math.sqrt(edges / 4))), max(2, int(math.sqrt(edges / 4))), seed=seed),
+    'geometric': lambda edges, seed: random_geometric_graph(max(2, edges // 8), seed=seed)[0],
+    'scale_free': lambda edges, seed: scale_free_graph(max(4, edges // 6), seed=seed),
+    'negative_dag': lambda edges, seed: negative_dag(max(2, edges // 5), edges, seed=seed),
+}
+
+def _bench_dijkstra(graph, source):
+    steps = dijkstra(graph, source)[2]
+    return {'settled': steps[0]['settled'], 'relaxations': steps[0]['relaxations'],
+            'queue': steps[0]['queue'], 'pushes': steps[0]['pushes']}
+
+def _bench_bellman_ford(graph, source):
+    result = bellman_ford(graph, source)
+    return {'iterations': result[2][0]['iterations'], 'relaxations': result[2][0]['relaxations']}
+
+def _bench_spfa(graph, source):
+    stats = {}
+    negative_cycle = spfa(graph, source, stats)[2]
+    return {'settled': stats['settled'], 'relaxations': stats['relaxations'],
+            'queue': stats['queue'], 'pushes': stats['pushes'],
+            'negative_cycle': negative_cycle is not None}
+
+# Алгоритмы для run_benchmarks(): функция (граф, источник) -> счётчики,
+# формат графа ('dict' или 'csr'), допускает ли отрицательные веса и
+# предельный размер в рёбрах. Новые варианты добавляются сюда же
+BENCHMARK_ALGORITHMS = {
+    'dijkstra': (_bench_dijkstra, 'dict', False, None),
+    'dijkstra_csr': (_bench_dijkstra, 'csr', False, None),
+    'bellman_ford': (_bench_bellman_ford, 'dict', True, 10 ** 5),
+    'bellman_ford_csr': (_bench_bellman_ford, 'csr', True, 10 ** 5),
+    'spfa': (_bench_spfa, 'dict', True, None),
+    'spfa_csr': (_bench_spfa, 'csr', True, None),
+}
+
+def _git_revision():
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_benchmarks(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), families=None, algorithms=None,
+                   repeats=3, output_path='shortest_path_benchmark.json', seed=0):
+
+    # Замер времени (медиана из repeats запусков), счётчиков алгоритма и пикового
+    # объёма памяти (tracemalloc, отдельный запуск) на синтетических графах.
+    # Результат пишется в JSON для сравнения между коммитами
+    families = families or list(BENCHMARK_FAMILIES)
+    algorithms = algorithms or list(BENCHMARK_ALGORITHMS)
+    results = []
+
+    print(f"\n{'Граф':<13} {'Рёбер':>9} {'Алгоритм':<17} {'Медиана, мс':>12} {'Пик памяти, КиБ':>16}  Счётчики")
+    for family in families:
+        for size in sizes:
+            graph = BENCHMARK_FAMILIES[family](size, seed)
+            csr = to_csr(graph)
+            source = next(iter(graph))
+            edge_count = csr.num_edges
+            has_negative = _weight_range(csr)[1] < 0
+
+            for name in algorithms:
+                func, graph_format, negative_ok, max_edges = BENCHMARK_ALGORITHMS[name]
+                if (has_negative and not negative_ok) or (max_edges is not None and edge_count > max_edges):
+                    continue
+                subject = csr if graph_format == 'csr' else graph
+
+                timings = []
+                for _ in range(repeats):
+                    started = time.perf_counter()
+                    counters = func(subject, source)
+                    timings.append(time.perf_counter() - started)
+
+                tracemalloc.start()
+                func(subject, source)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                timings.sort()
+                record = {
+                    'family': family, 'nodes': len(csr), 'edges': edge_count, 'algorithm': name,
+                    'median_ms': timings[len(timings) // 2] * 1e3, 'min_ms': timings[0] * 1e3,
+                    'repeats': repeats, 'peak_memory_bytes': peak, **counters,
+                }
+                results.append(record)
+                print(f"{family:<13} {edge_count:>9} {name:<17} {record['median_ms']:>12.2f} "
+                      f"{peak / 1024:>16.1f}  {counters}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+    if output_path is not None:
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты записаны в {output_path}")
+    return report
+
+# Раскладки spring_layout по структуре графа (вершины и рёбра с весами):
+# повторная отрисовка того же графа не пересчитывает раскладку. Ключ - хэш
+# структуры, а не сами кортежи рёбер, чтобы кэш не держал копию каждого графа;
+# хранятся только LAYOUT_CACHE_SIZE последних раскладок
+LAYOUT_CACHE_SIZE = 8
+_layout_cache = OrderedDict()
+
+def _graph_digest(G):
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(G.nodes)).encode())
+    digest.update(repr(list(G.edges(data='weight'))).encode())
+    return digest.digest()
+
+def _graph_layout(G):
+
+    key = _graph_digest(G)
+    pos = _layout_cache.get(key)
+    if pos is None:
+        pos = _layout_cache[key] = nx.spring_layout(G, seed=42)  # Фиксируем seed для одинакового расположения
+        if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    else:
+        _layout_cache.move_to_end(key)
+    return pos
+
+def _detail_nodes(graph, shortest_paths, max_nodes, seed=42):
+
+    # Вершины для упрощённой отрисовки большого графа: путь плюс случайная
+    # выборка его соседей, без пути - окрестность первой вершины в ширину.
+    # Всего не больше max_nodes: слишком длинный путь обрезается до начала
+    rng = random.Random(seed)
+    selected = list(dict.fromkeys(shortest_paths or []))
+    if len(selected) > max_nodes:
+        print(f"Путь из {len(selected)} вершин обрезан до первых {max_nodes} для отрисовки")
+        selected = selected[:max_nodes]
+    chosen = set(selected)
+
+    if selected:
+        neighbors = list(dict.fromkeys(neighbor for node in selected for neighbor in graph[node]
+                                       if neighbor not in chosen))
+        room = max(0, max_nodes - len(selected))
+        selected += rng.sample(neighbors, min(room, len(neighbors)))
+        return selected
+
+    queue = deque([next(iter(graph))])
+    chosen = {queue[0]}
+    while queue and len(selected) < max_nodes:
+        node = queue.popleft()
+        selected.append(node)
+        for neighbor in graph[node]:
+            if neighbor not in chosen:
+                chosen.add(neighbor)
+                queue.append(neighbor)
+    return selected
+
+def visualize_graph(graph, shortest_paths=None, title="Graph Visualization", algorithm_name="",
+                    output_path=None, max_nodes=300):
+
+    # output_path - файл PNG/SVG (формат по расширению) вместо окна plt.show(),
+    # работает и без дисплея. Если вершин больше max_nodes, рисуются только
+    # путь и выборка его окрестности (не больше max_nodes вершин, путь длиннее
+    # max_nodes рисуется только начальным участком)
     G = nx.DiGraph()
+    # Длина считается по всему пути, даже если на рисунок попадёт только его часть
+    path_length = sum(graph[u][v] for u, v in zip(shortest_paths, shortest_paths[1:])) \
+        if shortest_paths else 0
     
     # Добавляем узлы и ребра
-    for node in graph:
-        for neighbor, weight in graph[node].items():
-            G.add_edge(node, neighbor, weight=weight)
+    if max_nodes is not None and len(graph) > max_nodes:
+        selected = _detail_nodes(graph, shortest_paths, max_nodes)
+        selected_set = set(selected)
+        if shortest_paths and shortest_paths[-1] not in selected_set:
+            shown = next(i for i, node in enumerate(shortest_paths) if node not in selected_set)
+            title += f"\n(путь обрезан: показано {shown} из {len(shortest_paths)} вершин)"
+            shortest_paths = shortest_paths[:shown]
+        G.add_nodes_from(selected)
+        for node in selected:
+            for neighbor, weight in graph[node].items():
+                if neighbor in selected_set:
+                    G.add_edge(node, neighbor, weight=weight)
+        title += f"\n(показано {len(selected)} из {len(graph)} вершин)"
+    else:
+        for node in graph:
+            for neighbor, weight in graph[node].items():
+                G.add_edge(node, neighbor, weight=weight)
+    
+    # Подписи и крупные узлы только пока рисунок остаётся читаемым
+    detailed = G.number_of_nodes() <= 50
     
     plt.figure(figsize=(12, 8))
     
     # Позиционирование узлов
-    pos = nx.spring_layout(G, seed=42)  # Фиксируем seed для одинакового расположения
+    pos = _graph_layout(G)
     
     # Рисуем узлы
-    nx.draw_networkx_nodes(G, pos, node_size=800, node_color='lightblue', 
-                          alpha=0.9, linewidths=2, edgecolors='black')
+    nx.draw_networkx_nodes(G, pos, node_size=800 if detailed else 60, node_color='lightblue', 
+                          alpha=0.9, linewidths=2 if detailed else 0.5, edgecolors='black')
     
     # Рисуем ребра
-    nx.draw_networkx_edges(G, pos, edge_color='gray', arrows=True,
-                          arrowsize=20, arrowstyle='->', width=2)
+    # Стрелки рисуются отдельными патчами и на больших рисунках тормозят - там только линии
+    arrows = {'arrows': True, 'arrowstyle': '->'} if detailed else {'arrows': False}
+    nx.draw_networkx_edges(G, pos, edge_color='gray', width=2 if detailed else 0.5,
+                          **arrows, **({'arrowsize': 20} if detailed else {}))
     
-    # Подписи узлов
-    nx.draw_networkx_labels(G, pos, font_size=12, font_weight='bold')
-    
-    # Веса ребер
-    edge_labels = {(u, v): f"{d['weight']}" for u, v, d in G.edges(data=True)}
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=10)
+    if detailed:
+        # Подписи узлов
+        nx.draw_networkx_labels(G, pos, font_size=12, font_weight='bold')
+        
+        # Веса ребер
+        edge_labels = {(u, v): f"{d['weight']}" for u, v, d in G.edges(data=True)}
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=10)
     
     # Выделяем кратчайшие пути если они заданы
     if shortest_paths:
@@ -125,24 +2088,34 @@ def visualize_graph(graph, shortest_paths=None, title="Graph Visualization", alg
             path_edges.append((shortest_paths[i], shortest_paths[i + 1]))
         
         nx.draw_networkx_edges(G, pos, edgelist=path_edges,
-                              edge_color='red', width=4, arrows=True,
-                              arrowsize=25, arrowstyle='->')
+                              edge_color='red', width=4 if detailed else 2,
+                              **arrows, **({'arrowsize': 25} if detailed else {}))
         
         nx.draw_networkx_nodes(G, pos, nodelist=shortest_paths,
-                              node_color='red', node_size=1000,
-                              alpha=0.8, linewidths=3, edgecolors='darkred')
+                              node_color='red', node_size=1000 if detailed else 80,
+                              alpha=0.8, linewidths=3 if detailed else 1, edgecolors='darkred')
         
         # Добавляем информацию о пути в заголовок
         if algorithm_name:
-            path_length = sum(G[u][v]['weight'] for u, v in path_edges)
-            title += f"\n{algorithm_name}: {' → '.join(shortest_paths)} (длина: {path_length})"
+            path_text = ' → '.join(map(str, shortest_paths)) if len(shortest_paths) <= 20 \
+                else f"{len(shortest_paths)} вершин"
+            title += f"\n{algorithm_name}: {path_text} (длина: {path_length})"
     
     plt.title(title, fontsize=14, fontweight='bold', pad=20)
     plt.axis('off')
     plt.tight_layout()
-    plt.show()
+    _show_or_save(output_path)
 
-def plot_algorithm_comparison(dijkstra_distances, bellman_distances):
+def _show_or_save(output_path):
+
+    # Окно matplotlib или файл; фигура закрывается, чтобы пакетные запуски не копили память
+    if output_path is None:
+        plt.show()
+    else:
+        plt.savefig(output_path, dpi=150)
+        plt.close()
+
+def plot_algorithm_comparison(dijkstra_distances, bellman_distances, output_path=None):
 
     nodes = list(dijkstra_distances.keys())
     dijkstra_values = [dijkstra_distances[node] for node in nodes]
@@ -182,7 +2155,7 @@ def plot_algorithm_comparison(dijkstra_distances, bellman_distances):
     autolabel(bars2)
     
     plt.tight_layout()
-    plt.show()
+    _show_or_save(output_path)
 
 def print_detailed_analysis(dijkstra_results, bellman_results, start_node, target_node):
 
@@ -229,13 +2202,19 @@ graph_with_negative = {
     'F': {}
 }
 
-def main():
+def main(output_dir=None):
+
+    # output_dir - каталог для PNG вместо окон matplotlib
+    def output(name):
+        return None if output_dir is None else os.path.join(output_dir, name)
+
     print("=" * 70)
     print("АЛГОРИТМЫ ПОИСКА КРАТЧАЙШИХ ПУТЕЙ: ДЕЙКСТРА И БЕЛЛМАН-ФОРД")
     print("=" * 70)
     
     print("\n1. ВИЗУАЛИЗАЦИЯ ИСХОДНОГО ГРАФА")
-    visualize_graph(test_graph, title="Исходный граф (без отрицательных весов)")
+    visualize_graph(test_graph, title="Исходный граф (без отрицательных весов)",
+                    output_path=output('1_graph.png'))
     
     start_node = 'A'
     target_node = 'F'
@@ -243,48 +2222,51 @@ def main():
     print(f"\n2. ПОИСК КРАТЧАЙШЕГО ПУТИ ОТ {start_node} ДО {target_node}")
     
     print(f"\n--- АЛГОРИТМ ДЕЙКСТРЫ ---")
-    dijkstra_distances, dijkstra_previous, dijkstra_steps = dijkstra(test_graph, start_node)
+    # Полная трассировка нужна для детального анализа шагов
+    dijkstra_distances, dijkstra_previous, dijkstra_steps = dijkstra(test_graph, start_node, trace='full')
     
     # Восстановление пути для Дейкстры
-    path_dijkstra = []
-    current = target_node
-    while current is not None:
-        path_dijkstra.append(current)
-        current = dijkstra_previous[current]
-    path_dijkstra.reverse()
+    path_dijkstra = reconstruct_path(dijkstra_previous, target_node)
     
     print(f"Кратчайшие расстояния: {dijkstra_distances}")
     print(f"Кратчайший путь до {target_node}: {' -> '.join(path_dijkstra)}")
     print(f"Длина пути: {dijkstra_distances[target_node]}")
     
     print(f"\n--- АЛГОРИТМ БЕЛЛМАНА-ФОРДА ---")
-    bellman_distances, bellman_previous, bellman_steps, has_negative_cycle = bellman_ford(test_graph, start_node)
+    bellman_distances, bellman_previous, bellman_steps, has_negative_cycle = bellman_ford(test_graph, start_node, trace='full')
     
     # Восстановление пути для Беллмана-Форда
-    path_bellman = []
-    current = target_node
-    while current is not None:
-        path_bellman.append(current)
-        current = bellman_previous[current]
-    path_bellman.reverse()
+    path_bellman = reconstruct_path(bellman_previous, target_node)
     
     print(f"Кратчайшие расстояния: {bellman_distances}")
     print(f"Кратчайший путь до {target_node}: {' -> '.join(path_bellman)}")
     print(f"Длина пути: {bellman_distances[target_node]}")
     print(f"Обнаружен отрицательный цикл: {has_negative_cycle}")
     
+    print(f"\n--- ЗАПРОС ОТ ТОЧКИ ДО ТОЧКИ ---")
+    p2p_length, p2p_path, p2p_settled = shortest_path(test_graph, start_node, target_node)
+    print(f"Дейкстра с ранним остановом: {' -> '.join(p2p_path)} (длина: {p2p_length}, "
+          f"зафиксировано вершин: {p2p_settled})")
+    bi_length, bi_path, bi_settled = bidirectional_dijkstra(test_graph, start_node, target_node)
+    print(f"Двунаправленный Дейкстра: {' -> '.join(bi_path)} (длина: {bi_length}, "
+          f"зафиксировано вершин: {bi_settled})")
+    landmarks = LandmarkHeuristic(test_graph, choose_landmarks(test_graph, 2))
+    alt_length, alt_path, alt_expanded = a_star(test_graph, start_node, target_node, landmarks)
+    print(f"A* с ориентирами (ALT): {' -> '.join(alt_path)} (длина: {alt_length}, "
+          f"раскрыто вершин: {alt_expanded})")
+    
     print(f"\n3. ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ АЛГОРИТМА ДЕЙКСТРЫ")
     visualize_graph(test_graph, path_dijkstra, 
                    f"Алгоритм Дейкстры: путь от {start_node} до {target_node}",
-                   "Дейкстра")
+                   "Дейкстра", output_path=output('3_dijkstra.png'))
     
     print(f"\n4. ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ АЛГОРИТМА БЕЛЛМАНА-ФОРДА")
     visualize_graph(test_graph, path_bellman, 
                    f"Алгоритм Беллмана-Форда: путь от {start_node} до {target_node}",
-                   "Беллман-Форд")
+                   "Беллман-Форд", output_path=output('4_bellman_ford.png'))
     
     print(f"\n5. СРАВНИТЕЛЬНАЯ ВИЗУАЛИЗАЦИЯ РЕЗУЛЬТАТОВ")
-    plot_algorithm_comparison(dijkstra_distances, bellman_distances)
+    plot_algorithm_comparison(dijkstra_distances, bellman_distances, output('5_comparison.png'))
     
     # Детальный анализ
     print_detailed_analysis(
@@ -294,7 +2276,8 @@ def main():
     )
     
     print(f"\n6. ДЕМОНСТРАЦИЯ С ГРАФОМ, СОДЕРЖАЩИМ ОТРИЦАТЕЛЬНЫЕ ВЕСА")
-    visualize_graph(graph_with_negative, title="Граф с отрицательными весами")
+    visualize_graph(graph_with_negative, title="Граф с отрицательными весами",
+                    output_path=output('6_negative_graph.png'))
     
     # Проверяем граф с отрицательными весами
     bellman_neg_distances, bellman_neg_previous, bellman_neg_steps, has_neg_cycle = bellman_ford(graph_with_negative, 'A')
@@ -302,24 +2285,42 @@ def main():
     print(f"Результаты Беллмана-Форда для графа с отрицательными весами: {bellman_neg_distances}")
     print(f"Обнаружен отрицательный цикл: {has_neg_cycle}")
     
+    _, _, negative_cycle = spfa(graph_with_negative, 'A')
+    if negative_cycle:
+        print(f"Отрицательный цикл (SPFA): {' -> '.join(negative_cycle + negative_cycle[:1])}")
+    
     # Если нет отрицательного цикла, показываем путь
     if not has_neg_cycle:
         # Выбираем достижимую целевую вершину
         for node in ['D', 'E', 'C']:
             if bellman_neg_distances[node] < float('infinity'):
-                path_bellman_neg = []
-                current = node
-                while current is not None:
-                    path_bellman_neg.append(current)
-                    current = bellman_neg_previous[current]
-                path_bellman_neg.reverse()
+                path_bellman_neg = reconstruct_path(bellman_neg_previous, node)
                 
                 print(f"\nКратчайший путь до {node}: {' -> '.join(path_bellman_neg)}")
                 visualize_graph(graph_with_negative, path_bellman_neg, 
                                f"Алгоритм Беллмана-Форда (отриц. веса): путь от A до {node}",
-                               "Беллман-Форд")
+                               "Беллман-Форд", output_path=output('6_negative_path.png'))
                 break
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python Dijkstra_and_Bellman-Ford_algorithms.py --dynamic - замер инкрементального пересчёта
+    # --ch - предобработка и запросы иерархии сжатия
+    # --output КАТАЛОГ - сохранить рисунки в файлы вместо окон
+    # --benchmark [ФАЙЛ.json] - замеры на синтетических графах
+    if '--benchmark' in sys.argv[1:]:
+        position = sys.argv.index('--benchmark') + 1
+        if position < len(sys.argv):
+            run_benchmarks(output_path=sys.argv[position])
+        else:
+            run_benchmarks()
+    elif '--dynamic' in sys.argv[1:]:
+        benchmark_dynamic_updates()
+    elif '--ch' in sys.argv[1:]:
+        benchmark_contraction_hierarchy()
+    elif '--output' in sys.argv[1:]:
+        output_dir = sys.argv[sys.argv.index('--output') + 1]
+        os.makedirs(output_dir, exist_ok=True)
+        main(output_dir)
+    else:
+        main()
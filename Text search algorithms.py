@@ -1,43 +1,350 @@
+import json
+import mmap
+import operator
+import os
 import time
 import random
 import matplotlib.pyplot as plt
 import numpy as np
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from types import MappingProxyType
 
-class StringSearchAlgorithms:
-    """Класс для реализации и сравнения алгоритмов поиска подстрок"""
+
+def _code_function(sequence):
+    """Код символа: ord для str; у bytes, bytearray, mmap и memoryview элементы уже целые"""
+    return ord if isinstance(sequence, str) else operator.index
+
+
+def _as_sequence(data):
+    """Текст для посимвольного обхода: mmap и прочие буферы - через memoryview без копирования"""
+    if isinstance(data, (str, bytes, bytearray)):
+        return data
+    return memoryview(data).cast('B')
+
+
+class AhoCorasick:
+    """Автомат Ахо-Корасик: поиск всех образцов из набора за один проход по тексту"""
+    
+    def __init__(self, patterns):
+        # Уникальные непустые образцы в порядке появления
+        self.patterns = list(dict.fromkeys(p for p in patterns if len(p) > 0))
+        
+        # Сжатый алфавит: только символы образцов, остальные -> 0
+        self.alphabet = {}
+        for pattern in self.patterns:
+            for char in pattern:
+                if char not in self.alphabet:
+                    self.alphabet[char] = len(self.alphabet) + 1
+        self.width = len(self.alphabet) + 1
+        
+        # Бор (trie): goto[state] - словарь переходов на время построения
+        goto = [{}]
+        terminal = [-1]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                code = self.alphabet[char]
+                if code not in goto[state]:
+                    goto[state][code] = len(goto)
+                    goto.append({})
+                    terminal.append(-1)
+                state = goto[state][code]
+            terminal[state] = index
+        
+        # Полная таблица переходов ДКА в одном массиве: delta[state * width + code]
+        size = len(goto)
+        width = self.width
+        delta = array('i', [0]) * (size * width)
+        fail = array('i', [0]) * size
+        output_link = array('i', [-1]) * size
+        
+        queue = deque()
+        for code, child in goto[0].items():
+            delta[code] = child
+            queue.append(child)
+        
+        while queue:
+            state = queue.popleft()
+            link = fail[state]
+            # Ближайший суффикс, на котором заканчивается образец
+            output_link[state] = link if terminal[link] >= 0 else output_link[link]
+            
+            row = state * width
+            link_row = link * width
+            for code in range(width):
+                child = goto[state].get(code)
+                if child is None:
+                    delta[row + code] = delta[link_row + code]
+                else:
+                    delta[row + code] = child
+                    fail[child] = delta[link_row + code]
+                    queue.append(child)
+        
+        self.delta = delta
+        self.terminal = array('i', terminal)
+        self.output_link = output_link
+        self.lengths = [len(pattern) for pattern in self.patterns]
+    
+    def __len__(self):
+        return len(self.terminal)
+    
+    def finditer(self, text):
+        """Генератор совпадений (позиция начала, образец) в порядке окончания"""
+        delta = self.delta
+        terminal = self.terminal
+        output_link = self.output_link
+        alphabet_get = self.alphabet.get
+        width = self.width
+        patterns = self.patterns
+        lengths = self.lengths
+        
+        state = 0
+        for i, char in enumerate(_as_sequence(text)):
+            state = delta[state * width + alphabet_get(char, 0)]
+            match = state if terminal[state] >= 0 else output_link[state]
+            while match > 0:
+                index = terminal[match]
+                yield i - lengths[index] + 1, patterns[index]
+                match = output_link[match]
+    
+    def search(self, text):
+        """Все совпадения списком пар (образец, позиция)"""
+        return [(pattern, position) for position, pattern in self.finditer(text)]
+
+class SearchStats:
+    """Счётчики одного поиска (у каждого вызова свои)"""
+    __slots__ = ('comparisons',)
     
     def __init__(self):
-        self.comparison_count = 0
+        self.comparisons = 0
+
+
+def _every_position(n, stats):
+    """Пустой образец входит в каждую позицию текста длины n, как у str.find"""
+    stats.comparisons = 0
+    return range(n + 1)
+
+
+class CompiledPattern:
+    """Предкомпилированный образец: таблицы Бойера-Мура, Хорспула и Санди строятся один раз.
+    Объект неизменяемый (таблицы - MappingProxyType и кортежи) и разделяется через
+    кэш compile_pattern, поэтому счётчики сравнений ведёт каждый поиск сам
+    и записывает в переданный SearchStats"""
     
-    def reset_counter(self):
-        self.comparison_count = 0
+    def __init__(self, pattern):
+        self.pattern = pattern
+        m = len(pattern)
+        
+        # Плохой символ: последнее вхождение символа в образец
+        self.last = MappingProxyType({char: i for i, char in enumerate(pattern)})
+        # Хорспул: сдвиг по последнему символу окна (без последней позиции образца)
+        self.horspool_shift = MappingProxyType({char: m - 1 - i for i, char in enumerate(pattern[:-1])})
+        # Санди: сдвиг по символу сразу за окном
+        self.sunday_shift = MappingProxyType({char: m - i for i, char in enumerate(pattern)})
+        
+        self.good_suffix = tuple(self._good_suffix_table(pattern))
+        # Период образца - сдвиг после полного совпадения
+        self.period = self.good_suffix[0]
+        self._frozen = True
     
-    # 1. Наивный алгоритм
-    def naive_search(self, text, pattern):
-        """Наивный алгоритм поиска подстроки"""
-        self.reset_counter()
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("CompiledPattern неизменяемый")
+        object.__setattr__(self, name, value)
+    
+    @staticmethod
+    def _good_suffix_table(pattern):
+        """Сдвиги по правилу хорошего суффикса (сильный вариант), shift[j] для несовпадения в j-1"""
+        m = len(pattern)
+        shift = [0] * (m + 1)
+        border = [0] * (m + 1)
+        
+        # Границы суффиксов: border[i] - начало самой широкой границы суффикса pattern[i:]
+        i, j = m, m + 1
+        border[i] = j
+        while i > 0:
+            while j <= m and pattern[i - 1] != pattern[j - 1]:
+                if shift[j] == 0:
+                    shift[j] = j - i
+                j = border[j]
+            i -= 1
+            j -= 1
+            border[i] = j
+        
+        # Суффиксы, не встречающиеся внутри образца: сдвиг до границы всего образца
+        j = border[0]
+        for i in range(m + 1):
+            if shift[i] == 0:
+                shift[i] = j
+            if i == j:
+                j = border[j]
+        
+        return shift
+    
+    def boyer_moore_finditer(self, text, stats=None):
+        """Полный Бойер-Мур (плохой символ + хороший суффикс) с правилом Галила"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
+        pattern = self.pattern
+        last = self.last.get
+        good_suffix = self.good_suffix
+        period = self.period
+        n = len(text)
+        m = len(pattern)
+        
+        if m == 0:
+            yield from _every_position(n, stats)
+            return
+        
+        i = 0
+        lower = 0  # Правило Галила: позиции ниже lower уже совпали
+        try:
+            while i <= n - m:
+                j = m - 1
+                while j >= lower:
+                    comparisons += 1
+                    if pattern[j] != text[i + j]:
+                        break
+                    j -= 1
+                
+                if j < lower:
+                    stats.comparisons = comparisons
+                    yield i
+                    # Сдвиг на период: первые m - period символов окна заведомо совпадут
+                    i += period
+                    lower = m - period
+                else:
+                    i += max(good_suffix[j + 1], j - last(text[i + j], -1))
+                    lower = 0
+        finally:
+            stats.comparisons = comparisons
+    
+    def horspool_finditer(self, text, stats=None):
+        """Алгоритм Хорспула: сдвиг по последнему символу окна"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
+        pattern = self.pattern
+        shift = self.horspool_shift.get
         n = len(text)
         m = len(pattern)
         
-        for i in range(n - m + 1):
-            j = 0
-            while j < m:
-                self.comparison_count += 1
-                if text[i + j] != pattern[j]:
+        if m == 0:
+            yield from _every_position(n, stats)
+            return
+        
+        i = 0
+        try:
+            while i <= n - m:
+                j = m - 1
+                while j >= 0:
+                    comparisons += 1
+                    if pattern[j] != text[i + j]:
+                        break
+                    j -= 1
+                if j < 0:
+                    stats.comparisons = comparisons
+                    yield i
+                i += shift(text[i + m - 1], m)
+        finally:
+            stats.comparisons = comparisons
+    
+    def sunday_finditer(self, text, stats=None):
+        """Алгоритм Санди: сдвиг по символу сразу за окном"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
+        pattern = self.pattern
+        shift = self.sunday_shift.get
+        n = len(text)
+        m = len(pattern)
+        
+        i = 0
+        try:
+            while i <= n - m:
+                j = 0
+                while j < m:
+                    comparisons += 1
+                    if pattern[j] != text[i + j]:
+                        break
+                    j += 1
+                if j == m:
+                    stats.comparisons = comparisons
+                    yield i
+                if i + m >= n:
                     break
-                j += 1
-            if j == m:
-                return i, self.comparison_count
-        return -1, self.comparison_count
+                i += shift(text[i + m], m + 1)
+        finally:
+            stats.comparisons = comparisons
+    
+    def finditer(self, text, algorithm='boyer_moore', stats=None):
+        """Генератор всех вхождений выбранным алгоритмом; счётчики - в stats"""
+        return getattr(self, f'{algorithm}_finditer')(text, stats)
+    
+    def search(self, text, algorithm='boyer_moore', stats=None):
+        """Первое вхождение или -1"""
+        return next(self.finditer(text, algorithm, stats), -1)
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(pattern):
+    return CompiledPattern(pattern)
+
+
+def compile_pattern(pattern):
+    """Компиляция образца с кэшированием (как re.compile)"""
+    if isinstance(pattern, CompiledPattern):
+        return pattern
+    if not isinstance(pattern, (str, bytes)):
+        pattern = bytes(pattern)
+    return _compile_cached(pattern)
+
+
+class StringSearchAlgorithms:
+    """Класс для реализации и сравнения алгоритмов поиска подстрок.
+    Общего состояния нет: счётчики сравнений каждый поиск ведёт в своём SearchStats"""
+    
+    # 1. Наивный алгоритм
+    def naive_finditer(self, text, pattern, stats=None):
+        """Наивный алгоритм: генератор позиций всех вхождений"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
+        n = len(text)
+        m = len(pattern)
+        
+        try:
+            for i in range(n - m + 1):
+                j = 0
+                while j < m:
+                    comparisons += 1
+                    if text[i + j] != pattern[j]:
+                        break
+                    j += 1
+                if j == m:
+                    stats.comparisons = comparisons
+                    yield i
+        finally:
+            stats.comparisons = comparisons
+    
+    def naive_search(self, text, pattern):
+        """Наивный алгоритм поиска подстроки"""
+        return self._first(self.naive_finditer, text, pattern)
     
     # 2. Алгоритм Рабина-Карпа
-    def rabin_karp_search(self, text, pattern, q=101):
-        """Алгоритм Рабина-Карпа"""
-        self.reset_counter()
+    def rabin_karp_finditer(self, text, pattern, q=101, stats=None):
+        """Алгоритм Рабина-Карпа: генератор позиций всех вхождений"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
         n = len(text)
         m = len(pattern)
         d = 256  # размер алфавита
+        if m == 0:
+            yield from _every_position(n, stats)
+            return
+        text_code = _code_function(text)
+        pattern_code = _code_function(pattern)
         
         # Вычисление хеша для pattern и первого окна text
         h = 1
@@ -48,32 +355,124 @@ class StringSearchAlgorithms:
         text_hash = 0
         
         for i in range(m):
-            pattern_hash = (d * pattern_hash + ord(pattern[i])) % q
-            text_hash = (d * text_hash + ord(text[i])) % q
+            pattern_hash = (d * pattern_hash + pattern_code(pattern[i])) % q
+            text_hash = (d * text_hash + text_code(text[i])) % q
         
         # Поиск
-        for i in range(n - m + 1):
-            self.comparison_count += 1
-            if pattern_hash == text_hash:
-                # Проверка на коллизию
-                for j in range(m):
-                    self.comparison_count += 1
-                    if text[i + j] != pattern[j]:
-                        break
-                else:
-                    return i, self.comparison_count
-            
-            if i < n - m:
-                text_hash = (d * (text_hash - ord(text[i]) * h) + ord(text[i + m])) % q
-                if text_hash < 0:
-                    text_hash += q
+        try:
+            for i in range(n - m + 1):
+                comparisons += 1
+                if pattern_hash == text_hash:
+                    # Проверка на коллизию
+                    for j in range(m):
+                        comparisons += 1
+                        if text[i + j] != pattern[j]:
+                            break
+                    else:
+                        stats.comparisons = comparisons
+                        yield i
+                
+                if i < n - m:
+                    text_hash = (d * (text_hash - text_code(text[i]) * h) + text_code(text[i + m])) % q
+                    if text_hash < 0:
+                        text_hash += q
+        finally:
+            stats.comparisons = comparisons
+    
+    def rabin_karp_search(self, text, pattern, q=101):
+        """Алгоритм Рабина-Карпа"""
+        stats = SearchStats()
+        return next(self.rabin_karp_finditer(text, pattern, q, stats), -1), stats.comparisons
+    
+    # 2а. Рабин-Карп с модулем 2^61 - 1 (коллизии практически исключены)
+    HASH_MODULUS = (1 << 61) - 1
+    HASH_BASE = 1_000_000_007  # больше любого кода символа Unicode
+    
+    def _rolling_hash(self, sequence, code, length):
+        h = 0
+        for i in range(length):
+            h = (h * self.HASH_BASE + code(sequence[i])) % self.HASH_MODULUS
+        return h
+    
+    def rabin_karp64_finditer(self, text, pattern, stats=None):
+        """Рабин-Карп с 61-битным хешем: генератор позиций всех вхождений"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
+        n = len(text)
+        m = len(pattern)
+        if m > n:
+            return
+        if m == 0:
+            yield from _every_position(n, stats)
+            return
+        q = self.HASH_MODULUS
+        d = self.HASH_BASE
+        text_code = _code_function(text)
+        
+        # Степень основания для удаления первого символа окна - один раз
+        h = pow(d, m - 1, q)
+        pattern_hash = self._rolling_hash(pattern, _code_function(pattern), m)
+        text_hash = self._rolling_hash(text, text_code, m)
+        
+        try:
+            for i in range(n - m + 1):
+                comparisons += 1
+                if pattern_hash == text_hash:
+                    for j in range(m):
+                        comparisons += 1
+                        if text[i + j] != pattern[j]:
+                            break
+                    else:
+                        stats.comparisons = comparisons
+                        yield i
+                
+                if i < n - m:
+                    text_hash = ((text_hash - text_code(text[i]) * h) * d + text_code(text[i + m])) % q
+        finally:
+            stats.comparisons = comparisons
+    
+    def rabin_karp64_search(self, text, pattern):
+        """Рабин-Карп с 61-битным хешем"""
+        return self._first(self.rabin_karp64_finditer, text, pattern)
+    
+    def rabin_karp_multi_search(self, text, patterns):
+        """Несколько образцов: хеши образцов одной длины в словаре, один проход на каждую длину"""
+        comparisons = 0
+        n = len(text)
+        q = self.HASH_MODULUS
+        d = self.HASH_BASE
+        text_code = _code_function(text)
+        
+        by_length = defaultdict(dict)
+        for pattern in dict.fromkeys(patterns):
+            if 0 < len(pattern) <= n:
+                key = self._rolling_hash(pattern, _code_function(pattern), len(pattern))
+                by_length[len(pattern)].setdefault(key, []).append(pattern)
+        
+        matches = []
+        for m, table in by_length.items():
+            h = pow(d, m - 1, q)
+            text_hash = self._rolling_hash(text, text_code, m)
+            for i in range(n - m + 1):
+                comparisons += 1
+                for pattern in table.get(text_hash, ()):
+                    for j in range(m):
+                        comparisons += 1
+                        if text[i + j] != pattern[j]:
+                            break
+                    else:
+                        matches.append((pattern, i))
+                if i < n - m:
+                    text_hash = ((text_hash - text_code(text[i]) * h) * d + text_code(text[i + m])) % q
         
-        return -1, self.comparison_count
+        matches.sort(key=lambda match: (match[1], len(match[0])))
+        return matches, comparisons
     
     # 3. Алгоритм Бойера-Мура (упрощенная версия)
-    def boyer_moore_search(self, text, pattern):
-        """Алгоритм Бойера-Мура с правилом плохого символа"""
-        self.reset_counter()
+    def boyer_moore_finditer(self, text, pattern, stats=None):
+        """Алгоритм Бойера-Мура с правилом плохого символа: генератор всех вхождений"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
         n = len(text)
         m = len(pattern)
         
@@ -83,31 +482,43 @@ class StringSearchAlgorithms:
             bad_char[pattern[i]] = i
         
         i = 0
-        while i <= n - m:
-            j = m - 1
-            # Сравнение с конца
-            while j >= 0:
-                self.comparison_count += 1
-                if pattern[j] != text[i + j]:
-                    break
-                j -= 1
-            
-            if j < 0:
-                return i, self.comparison_count
-            else:
-                # Сдвиг по правилу плохого символа
-                char = text[i + j]
-                shift = bad_char.get(char, -1)
-                i += max(1, j - shift)
-        
-        return -1, self.comparison_count
+        try:
+            while i <= n - m:
+                j = m - 1
+                # Сравнение с конца
+                while j >= 0:
+                    comparisons += 1
+                    if pattern[j] != text[i + j]:
+                        break
+                    j -= 1
+                
+                if j < 0:
+                    stats.comparisons = comparisons
+                    yield i
+                    # После совпадения - сдвиг по символу сразу за окном
+                    i += m - bad_char.get(text[i + m], -1) if i + m < n else 1
+                else:
+                    # Сдвиг по правилу плохого символа
+                    char = text[i + j]
+                    shift = bad_char.get(char, -1)
+                    i += max(1, j - shift)
+        finally:
+            stats.comparisons = comparisons
+    
+    def boyer_moore_search(self, text, pattern):
+        """Алгоритм Бойера-Мура с правилом плохого символа"""
+        return self._first(self.boyer_moore_finditer, text, pattern)
     
     # 4. Алгоритм Кнута-Морриса-Пратта
-    def kmp_search(self, text, pattern):
-        """Алгоритм Кнута-Морриса-Пратта"""
-        self.reset_counter()
+    def kmp_finditer(self, text, pattern, stats=None):
+        """Алгоритм Кнута-Морриса-Пратта: генератор позиций всех вхождений"""
+        stats = stats if stats is not None else SearchStats()
+        comparisons = 0
         n = len(text)
         m = len(pattern)
+        if m == 0:
+            yield from _every_position(n, stats)
+            return
         
         # Префикс-функция
         lps = [0] * m
@@ -115,7 +526,7 @@ class StringSearchAlgorithms:
         i = 1
         
         while i < m:
-            self.comparison_count += 1
+            comparisons += 1
             if pattern[i] == pattern[length]:
                 length += 1
                 lps[i] = length
@@ -129,21 +540,614 @@ class StringSearchAlgorithms:
         
         # Поиск
         i = j = 0
-        while i < n:
-            self.comparison_count += 1
-            if pattern[j] == text[i]:
-                i += 1
-                j += 1
-            
-            if j == m:
-                return i - j, self.comparison_count
-            elif i < n and pattern[j] != text[i]:
-                if j != 0:
-                    j = lps[j - 1]
-                else:
+        try:
+            while i < n:
+                comparisons += 1
+                if pattern[j] == text[i]:
                     i += 1
+                    j += 1
+                
+                if j == m:
+                    stats.comparisons = comparisons
+                    yield i - j
+                    # Продолжение с самой длинной границы найденного вхождения
+                    j = lps[j - 1]
+                elif i < n and pattern[j] != text[i]:
+                    if j != 0:
+                        j = lps[j - 1]
+                    else:
+                        i += 1
+        finally:
+            stats.comparisons = comparisons
+    
+    def kmp_search(self, text, pattern):
+        """Алгоритм Кнута-Морриса-Пратта"""
+        return self._first(self.kmp_finditer, text, pattern)
+    
+    @staticmethod
+    def _first(finditer, text, pattern):
+        """Первое вхождение или -1 и число сравнений до него"""
+        stats = SearchStats()
+        return next(finditer(text, pattern, stats=stats), -1), stats.comparisons
+    
+    # 4а. Полный Бойер-Мур, Хорспул и Санди на скомпилированных образцах
+    def _compiled_search(self, text, pattern, algorithm):
+        stats = SearchStats()
+        return compile_pattern(pattern).search(text, algorithm, stats), stats.comparisons
+    
+    def boyer_moore_galil_search(self, text, pattern):
+        """Полный Бойер-Мур: плохой символ, хороший суффикс и правило Галила"""
+        return self._compiled_search(text, pattern, 'boyer_moore')
+    
+    def horspool_search(self, text, pattern):
+        """Алгоритм Бойера-Мура-Хорспула"""
+        return self._compiled_search(text, pattern, 'horspool')
+    
+    def sunday_search(self, text, pattern):
+        """Алгоритм Санди (Quick Search)"""
+        return self._compiled_search(text, pattern, 'sunday')
+    
+    def finditer(self, text, pattern, algorithm='kmp', stats=None):
+        """Генератор всех вхождений выбранным алгоритмом (str, bytes, bytearray, mmap);
+        счётчики - в stats"""
+        if algorithm in ('boyer_moore_galil', 'horspool', 'sunday'):
+            return compile_pattern(pattern).finditer(text, algorithm.replace('_galil', ''), stats)
+        return getattr(self, f'{algorithm}_finditer')(text, pattern, stats=stats)
+    
+    def find_all(self, text, pattern, algorithm='kmp'):
+        """Все вхождения выбранным алгоритмом: (список позиций, число сравнений)"""
+        stats = SearchStats()
+        positions = list(self.finditer(text, pattern, algorithm, stats))
+        return positions, stats.comparisons
+    
+    # 5. Алгоритм Ахо-Корасик (несколько образцов)
+    def aho_corasick_search(self, text, patterns):
+        """Поиск всех образцов набора; patterns - список или готовый AhoCorasick"""
+        automaton = patterns if isinstance(patterns, AhoCorasick) else AhoCorasick(patterns)
         
-        return -1, self.comparison_count
+        matches = automaton.search(text)
+        # Один переход автомата на каждый символ текста
+        return matches, len(text)
+
+# Поиск в больших файлах
+def search_file(path, pattern, algorithm='kmp', chunk_size=1 << 24,
+                encoding='utf-8', searcher=None, stats=None):
+    """Генератор смещений всех вхождений в файле: mmap по частям с перекрытием m-1 байт;
+    сравнения всех частей суммируются в stats"""
+    if isinstance(pattern, str):
+        pattern = pattern.encode(encoding)
+    m = len(pattern)
+    searcher = searcher or StringSearchAlgorithms()
+    stats = stats if stats is not None else SearchStats()
+    comparisons = 0
+    window_stats = SearchStats()
+    
+    with open(path, 'rb') as file:
+        size = file.seek(0, 2)
+        if size < m or m == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, size - m + 1, chunk_size):
+                    # Хвост m-1 байт следующей части - для вхождений на границе
+                    window = view[start:min(start + chunk_size + m - 1, size)]
+                    try:
+                        for position in searcher.finditer(window, pattern, algorithm, window_stats):
+                            # Вхождения, начинающиеся в перекрытии, найдёт следующая часть
+                            if position < chunk_size:
+                                stats.comparisons = comparisons + window_stats.comparisons
+                                yield start + position
+                    finally:
+                        comparisons += window_stats.comparisons
+                        window_stats.comparisons = 0
+                        window.release()
+            finally:
+                view.release()
+                stats.comparisons = comparisons
+
+# Параллельный поиск по частям (шардам)
+_search_worker = {}
+
+
+def _attach_search_source(kind, source, size, pattern, algorithm):
+    """Инициализация процесса пула: текст из общей памяти или mmap файла"""
+    if kind == 'shm':
+        handle = shared_memory.SharedMemory(name=source)
+        data = handle.buf[:size]
+    else:
+        file = open(source, 'rb')
+        handle = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        file.close()
+        data = memoryview(handle)[:size]
+    _search_worker.update(handle=handle, data=data, pattern=pattern, algorithm=algorithm)
+
+
+def _search_shards(shards):
+    """Поиск в шардах (начало, конец с перекрытием, конец своей части): позиции и сравнения"""
+    data = _search_worker['data']
+    pattern = _search_worker['pattern']
+    algorithm = _search_worker['algorithm']
+    searcher = StringSearchAlgorithms()
+    positions = []
+    comparisons = 0
+    
+    for start, stop, owned in shards:
+        window = data[start:stop]
+        stats = SearchStats()
+        try:
+            for position in searcher.finditer(window, pattern, algorithm, stats):
+                if start + position < owned:
+                    positions.append(start + position)
+        finally:
+            comparisons += stats.comparisons
+            window.release()
+    
+    return positions, comparisons
+
+
+def _run_sharded(kind, source, size, pattern, algorithm, workers, shard_size):
+    """Разбиение на шарды с перекрытием m-1 и запуск в пуле процессов"""
+    m = len(pattern)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(1 << 16, -(-size // (4 * workers)))
+    
+    shards = [(start, min(start + shard_size + m - 1, size), min(start + shard_size, size))
+              for start in range(0, size - m + 1, shard_size)]
+    # Несколько шардов на задачу, чтобы пул был равномерно загружен
+    batches = [shards[i::workers] for i in range(workers) if shards[i::workers]]
+    
+    results = []
+    if workers == 1:
+        _attach_search_source(kind, source, size, pattern, algorithm)
+        try:
+            results.append(_search_shards(shards))
+        finally:
+            _search_worker.pop('data').release()
+            handle = _search_worker.pop('handle')
+            handle.close()
+            _search_worker.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_search_source,
+                                 initargs=(kind, source, size, pattern, algorithm)) as pool:
+            results = list(pool.map(_search_shards, batches))
+    
+    # Слияние: позиции уникальны по владельцу шарда, set - на всякий случай
+    positions = sorted(set(position for part, _ in results for position in part))
+    return positions, sum(comparisons for _, comparisons in results)
+
+
+def _encode_for_search(text, pattern):
+    """Байтовое представление текста и образца: ASCII или UTF-32-LE (4 байта на символ)"""
+    if not isinstance(text, str):
+        if isinstance(pattern, str):
+            pattern = pattern.encode('utf-8')
+        return text, bytes(pattern), 1
+    if text.isascii() and pattern.isascii():
+        return text.encode('ascii'), pattern.encode('ascii'), 1
+    return text.encode('utf-32-le'), pattern.encode('utf-32-le'), 4
+
+
+def parallel_search(text, pattern, algorithm='kmp', workers=None, shard_size=None):
+    """Все вхождения в тексте: шарды с перекрытием в пуле процессов над общей памятью"""
+    if len(pattern) == 0 or len(pattern) > len(text):
+        return [], 0
+    if isinstance(text, str) and text.isascii() and not pattern.isascii():
+        return [], 0
+    data, pattern_bytes, unit = _encode_for_search(text, pattern)
+    size = len(memoryview(data).cast('B'))
+    
+    block = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        block.buf[:size] = memoryview(data).cast('B')
+        positions, comparisons = _run_sharded('shm', block.name, size, pattern_bytes,
+                                              algorithm, workers, shard_size)
+    finally:
+        block.close()
+        block.unlink()
+    
+    if unit > 1:
+        # В UTF-32 совпадение засчитывается только с границы символа
+        positions = [position // unit for position in positions if position % unit == 0]
+    return positions, comparisons
+
+
+def parallel_search_file(path, pattern, algorithm='kmp', workers=None, shard_size=None,
+                         encoding='utf-8'):
+    """Все вхождения в файле: каждый процесс отображает файл через mmap сам"""
+    if isinstance(pattern, str):
+        pattern = pattern.encode(encoding)
+    size = os.path.getsize(path)
+    if len(pattern) == 0 or len(pattern) > size:
+        return [], 0
+    return _run_sharded('file', path, size, bytes(pattern), algorithm, workers, shard_size)
+
+
+def benchmark_parallel_search(size=1 << 24, pattern=b'needle', algorithm='horspool',
+                              max_workers=None, seed=42):
+    """Пропускная способность параллельного поиска при 1..N процессах"""
+    max_workers = max_workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+    text = rng.randbytes(size)
+    expected = None
+    results = {}
+    
+    print("\n=== ПАРАЛЛЕЛЬНЫЙ ПОИСК ===")
+    print(f"Размер текста: {size} байт, алгоритм: {algorithm}")
+    for workers in range(1, max_workers + 1):
+        start_time = time.time()
+        positions, _ = parallel_search(text, pattern, algorithm, workers=workers)
+        elapsed = time.time() - start_time
+        
+        if expected is None:
+            expected = positions
+        results[workers] = size / elapsed / 1e6
+        print(f"Процессов: {workers:>2}  время: {elapsed * 1000:8.1f} мс  "
+              f"{results[workers]:8.2f} МБ/с  совпадает с 1 процессом: {positions == expected}")
+    return results
+
+# Индексы для многократных запросов к неизменному тексту
+def _text_codes(text):
+    """Коды символов текста и вид текста: bytes, ascii или unicode (UTF-32-BE)"""
+    if isinstance(text, str):
+        if text.isascii():
+            return np.frombuffer(text.encode('ascii'), dtype=np.uint8), 'ascii'
+        return np.frombuffer(text.encode('utf-32-be'), dtype='>u4'), 'unicode'
+    return np.frombuffer(memoryview(text).cast('B'), dtype=np.uint8), 'bytes'
+
+
+def _pattern_key(pattern, kind):
+    """Образец в байтах того же представления, что и текст (None - вхождений нет)"""
+    if kind == 'bytes':
+        return pattern.encode('utf-8') if isinstance(pattern, str) else bytes(pattern)
+    if kind == 'ascii':
+        return pattern.encode('ascii') if pattern.isascii() else None
+    return pattern.encode('utf-32-be')
+
+
+def suffix_array(codes):
+    """Суффиксный массив удвоением префиксов (сортировки NumPy), O(n log² n)"""
+    n = len(codes)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    _, rank = np.unique(np.asarray(codes), return_inverse=True)
+    rank = rank.astype(np.int64).ravel()
+    k = 1
+    while True:
+        # Ключ суффикса - пара рангов (первые k символов, следующие k символов)
+        second = np.zeros(n, dtype=np.int64)
+        if k < n:
+            second[:n - k] = rank[k:] + 1
+        order = np.argsort(rank * (n + 1) + second, kind='stable')
+        
+        key_rank = rank[order]
+        key_second = second[order]
+        changed = np.zeros(n, dtype=np.int64)
+        changed[1:] = (key_rank[1:] != key_rank[:-1]) | (key_second[1:] != key_second[:-1])
+        new_rank = np.cumsum(changed)
+        
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = new_rank
+        if new_rank[-1] == n - 1:
+            return order
+        k *= 2
+
+
+def lcp_array(codes, sa):
+    """Массив LCP алгоритмом Касаи: lcp[i] - общий префикс суффиксов sa[i-1] и sa[i]"""
+    n = len(sa)
+    codes = np.asarray(codes)
+    dtype, typecode = (np.int32, 'i') if n < 2 ** 31 else (np.int64, 'q')
+    
+    # Компактные буферы с быстрой поэлементной индексацией вместо списков Python:
+    # текст - bytes или array('I'), ранги и LCP - 4 байта на символ
+    if codes.dtype.itemsize == 1:
+        text = codes.tobytes()
+    else:
+        text = array('I', codes.astype(np.uint32).tobytes())
+    order = array(typecode, np.asarray(sa, dtype=dtype).tobytes())
+    rank_values = np.empty(n, dtype=dtype)
+    rank_values[np.asarray(sa)] = np.arange(n, dtype=dtype)
+    rank = array(typecode, rank_values.tobytes())
+    del rank_values
+    lcp = array(typecode, bytes(np.dtype(dtype).itemsize * n))
+    
+    h = 0
+    for position in range(n):
+        row = rank[position]
+        if row > 0:
+            previous = order[row - 1]
+            while position + h < n and previous + h < n and text[position + h] == text[previous + h]:
+                h += 1
+            lcp[row] = h
+            if h > 0:
+                h -= 1
+        else:
+            h = 0
+    
+    return np.frombuffer(lcp, dtype=dtype)
+
+
+class SuffixArrayIndex:
+    """Суффиксный массив и LCP: count/locate за O(m log n), сохранение и загрузка через mmap"""
+    
+    def __init__(self, text=None, codes=None, sa=None, lcp=None, kind='bytes'):
+        if text is not None:
+            codes, kind = _text_codes(text)
+            sa = suffix_array(codes)
+            sa = sa.astype(np.int32) if len(sa) < 2 ** 31 else sa
+            lcp = lcp_array(codes, sa)
+        self.codes = codes
+        self.sa = sa
+        self.lcp = lcp
+        self.kind = kind
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    @property
+    def nbytes(self):
+        """Размер индекса в байтах (текст, SA и LCP)"""
+        return sum(np.asarray(array).nbytes for array in (self.codes, self.sa, self.lcp))
+    
+    def _suffix_prefix(self, row, length):
+        position = int(self.sa[row])
+        return self.codes[position:position + length].tobytes()
+    
+    def _range(self, key):
+        """Полуинтервал строк суффиксного массива, начинающихся с key (два бинарных поиска)"""
+        length = len(key) // self.codes.itemsize
+        lo, hi = 0, len(self.sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix_prefix(mid, length) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+        hi = len(self.sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._suffix_prefix(mid, length) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return start, lo
+    
+    def count(self, pattern):
+        """Число вхождений образца"""
+        key = _pattern_key(pattern, self.kind)
+        if not key:
+            return 0
+        start, stop = self._range(key)
+        return stop - start
+    
+    def locate(self, pattern):
+        """Отсортированные позиции всех вхождений образца"""
+        key = _pattern_key(pattern, self.kind)
+        if not key:
+            return []
+        start, stop = self._range(key)
+        return sorted(np.asarray(self.sa[start:stop]).tolist())
+    
+    def longest_repeat(self):
+        """Самая длинная повторяющаяся подстрока (по максимуму LCP): (позиция, длина)"""
+        if len(self.lcp) < 2:
+            return -1, 0
+        row = int(np.argmax(self.lcp))
+        return int(self.sa[row]), int(self.lcp[row])
+    
+    def save(self, directory):
+        """Сохранение в каталог: массивы .npy и meta.json"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'codes.npy'), np.asarray(self.codes))
+        np.save(os.path.join(directory, 'sa.npy'), np.asarray(self.sa))
+        np.save(os.path.join(directory, 'lcp.npy'), np.asarray(self.lcp))
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({'type': 'suffix_array', 'kind': self.kind, 'length': len(self)}, file)
+    
+    @classmethod
+    def load(cls, directory):
+        """Загрузка из каталога; массивы отображаются в память (mmap_mode='r')"""
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                  for name in ('codes', 'sa', 'lcp')}
+        return cls(kind=meta['kind'], **arrays)
+
+
+class FMIndex:
+    """FM-индекс: BWT, разреженные контрольные точки Occ и выборка суффиксного массива"""
+    
+    def __init__(self, index=None, sample_rate=32, checkpoint=None, arrays=None, meta=None):
+        if index is not None:
+            arrays, meta = self._build(index, sample_rate, checkpoint)
+        self.bwt = arrays['bwt']
+        self.occ = arrays['occ']
+        self.counts = arrays['counts']
+        self.symbols = arrays['symbols']
+        self.sampled_rows = arrays['sampled_rows']
+        self.sampled_positions = arrays['sampled_positions']
+        self.kind = meta['kind']
+        self.checkpoint = meta['checkpoint']
+        self.sample_rate = meta['sample_rate']
+        self.terminator_row = meta['terminator_row']
+    
+    @property
+    def nbytes(self):
+        """Размер индекса в байтах"""
+        return sum(np.asarray(array).nbytes for array in (
+            self.bwt, self.occ, self.counts, self.symbols, self.sampled_rows, self.sampled_positions))
+    
+    @staticmethod
+    def _build(index, sample_rate, checkpoint):
+        if not isinstance(index, SuffixArrayIndex):
+            index = SuffixArrayIndex(index)
+        codes = np.asarray(index.codes)
+        n = len(codes)
+        position_dtype = np.int32 if n < 2 ** 31 else np.int64
+        
+        # Суффиксный массив текста с терминатором: пустой суффикс - первым
+        full_sa = np.concatenate([[n], np.asarray(index.sa, dtype=np.int64)])
+        
+        # Сжатый алфавит: символ 0 - терминатор, символы текста - 1..σ. В BWT хранится
+        # номер символа минус 1 (для байтов хватает uint8), а строка терминатора
+        # запоминается отдельно - в массиве на её месте 0, Occ это учитывает
+        symbols, mapped = np.unique(codes, return_inverse=True)
+        sigma = len(symbols)
+        dtype = np.uint8 if sigma <= 256 else np.uint16 if sigma <= 65536 else np.uint32
+        mapped = mapped.ravel().astype(dtype)
+        bwt = np.zeros(n + 1, dtype=dtype)
+        bwt[full_sa > 0] = mapped[full_sa[full_sa > 0] - 1]
+        terminator_row = int(np.flatnonzero(full_sa == 0)[0]) if n else 0
+        del mapped
+        
+        frequencies = np.bincount(bwt, minlength=max(sigma, 1))[:sigma]
+        if sigma:
+            frequencies[0] -= 1  # заглушка на месте терминатора
+        counts = np.concatenate([[0, 1], 1 + np.cumsum(frequencies)[:-1]]).astype(np.int64)
+        
+        # Контрольные точки Occ (uint32) так редко, чтобы таблица занимала не больше
+        # ~0.5 байта на символ; между ними ранг считается по самому BWT
+        if checkpoint is None:
+            checkpoint = 1 << max(6, (8 * sigma - 1).bit_length())
+        occ = np.zeros(((n + 1) // checkpoint + 1, max(sigma, 1)), dtype=np.uint32)
+        
+        # Один проход по BWT: гистограммы блоков частями, затем накопленные суммы
+        chunk = max(checkpoint, (1 << 22) // checkpoint * checkpoint)
+        totals = np.zeros(sigma, dtype=np.int64)
+        for start in range(0, (len(occ) - 1) * checkpoint, chunk):
+            stop = min(start + chunk, (len(occ) - 1) * checkpoint)
+            part = bwt[start:stop].astype(np.int64)
+            blocks = (stop - start) // checkpoint
+            keys = (np.arange(stop - start) // checkpoint) * sigma + part
+            histogram = np.bincount(keys, minlength=blocks * sigma).reshape(blocks, sigma)
+            block = start // checkpoint
+            occ[block + 1:block + 1 + blocks] = totals + np.cumsum(histogram, axis=0)
+            totals += histogram.sum(axis=0)
+        
+        # Выборка SA: строки, где позиция кратна sample_rate
+        sampled_rows = np.flatnonzero(full_sa % sample_rate == 0).astype(position_dtype)
+        arrays = {
+            'bwt': bwt, 'occ': occ, 'counts': counts, 'symbols': symbols,
+            'sampled_rows': sampled_rows,
+            'sampled_positions': full_sa[sampled_rows].astype(position_dtype),
+        }
+        meta = {'kind': index.kind, 'checkpoint': checkpoint, 'sample_rate': sample_rate,
+                'terminator_row': terminator_row}
+        return arrays, meta
+    
+    def _occ(self, symbol, row):
+        """Число symbol в BWT до строки row: ближайшая контрольная точка и подсчёт внутри блока"""
+        stored = symbol - 1
+        checkpoint = self.checkpoint
+        block = row // checkpoint
+        start = block * checkpoint
+        if row - start > checkpoint // 2 and block + 1 < len(self.occ):
+            stop = start + checkpoint
+            result = int(self.occ[block + 1, stored]) - int(np.count_nonzero(self.bwt[row:stop] == stored))
+        else:
+            result = int(self.occ[block, stored]) + int(np.count_nonzero(self.bwt[start:row] == stored))
+        if stored == 0 and self.terminator_row < row:
+            result -= 1
+        return result
+    
+    def _symbols_of(self, pattern):
+        key = _pattern_key(pattern, self.kind)
+        if not key:
+            return None
+        dtype = '>u4' if self.kind == 'unicode' else np.uint8
+        codes = np.frombuffer(key, dtype=dtype)
+        positions = np.searchsorted(self.symbols, codes)
+        clipped = np.minimum(positions, len(self.symbols) - 1)
+        if len(self.symbols) == 0 or np.any(self.symbols[clipped] != codes):
+            return None
+        return (positions + 1).tolist()
+    
+    def _range(self, pattern):
+        """Обратный поиск: интервал строк BWT-матрицы за O(m) шагов LF"""
+        symbols = self._symbols_of(pattern)
+        if symbols is None:
+            return 0, 0
+        lo, hi = 0, len(self.bwt)
+        for symbol in reversed(symbols):
+            lo = int(self.counts[symbol]) + self._occ(symbol, lo)
+            hi = int(self.counts[symbol]) + self._occ(symbol, hi)
+            if lo >= hi:
+                return 0, 0
+        return lo, hi
+    
+    def count(self, pattern):
+        """Число вхождений образца"""
+        lo, hi = self._range(pattern)
+        return hi - lo
+    
+    def _position(self, row):
+        # LF-шаги назад по тексту до строки из выборки SA
+        steps = 0
+        while True:
+            index = int(np.searchsorted(self.sampled_rows, row))
+            if index < len(self.sampled_rows) and self.sampled_rows[index] == row:
+                return int(self.sampled_positions[index]) + steps
+            symbol = int(self.bwt[row]) + 1
+            row = int(self.counts[symbol]) + self._occ(symbol, row)
+            steps += 1
+    
+    def locate(self, pattern):
+        """Отсортированные позиции всех вхождений образца"""
+        lo, hi = self._range(pattern)
+        return sorted(self._position(row) for row in range(lo, hi))
+    
+    def save(self, directory):
+        """Сохранение в каталог: массивы .npy и meta.json"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ('bwt', 'occ', 'counts', 'symbols', 'sampled_rows', 'sampled_positions'):
+            np.save(os.path.join(directory, f'{name}.npy'), np.asarray(getattr(self, name)))
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({'type': 'fm_index', 'kind': self.kind, 'checkpoint': self.checkpoint,
+                       'sample_rate': self.sample_rate, 'terminator_row': self.terminator_row}, file)
+    
+    @classmethod
+    def load(cls, directory):
+        """Загрузка из каталога; массивы отображаются в память (mmap_mode='r')"""
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                  for name in ('bwt', 'occ', 'counts', 'symbols', 'sampled_rows', 'sampled_positions')}
+        return cls(arrays=arrays, meta=meta)
+
+
+def index_demo(text_length=200000, queries=1000, seed=42):
+    """Сравнение индексов с линейным поиском на серии запросов к одному тексту"""
+    rng = random.Random(seed)
+    text = ''.join(rng.choice('acgt') for _ in range(text_length))
+    patterns = [text[i:i + rng.randint(6, 12)]
+                for i in (rng.randrange(text_length - 12) for _ in range(queries))]
+    
+    start_time = time.time()
+    index = SuffixArrayIndex(text)
+    sa_build = time.time() - start_time
+    start_time = time.time()
+    fm_index = FMIndex(index)
+    fm_build = time.time() - start_time
+    
+    timings = {}
+    for name, count in (('Суффиксный массив', index.count), ('FM-индекс', fm_index.count),
+                        ('str.count (без перекрытий)', text.count)):
+        start_time = time.time()
+        total = sum(count(pattern) for pattern in patterns)
+        timings[name] = (time.time() - start_time, total)
+    
+    print("\n=== ИНДЕКСЫ ДЛЯ ПОВТОРНЫХ ЗАПРОСОВ ===")
+    print(f"Текст: {text_length} символов, запросов: {queries}")
+    print(f"Построение: суффиксный массив + LCP {sa_build * 1000:.0f} мс, FM-индекс {fm_build * 1000:.0f} мс")
+    print(f"Размер: суффиксный массив + LCP {index.nbytes / text_length:.2f} байт/символ, "
+          f"FM-индекс {fm_index.nbytes / text_length:.2f} байт/символ")
+    for name, (elapsed, total) in timings.items():
+        print(f"{name}: {elapsed * 1000:.1f} мс на все запросы, вхождений {total}")
 
 # Генерация тестовых данных
 def generate_test_cases():
@@ -154,7 +1158,9 @@ def generate_test_cases():
         'naive': ('a' * 1000 + 'b', 'a' * 100),  # Паттерн в начале
         'rabin_karp': ('abc' * 100, 'abc'),  # Минимум коллизий
         'boyer_moore': ('x' * 100 + 'pattern', 'pattern'),  # Паттерн в конце
-        'kmp': ('a' * 1000, 'a' * 50)  # Длинные совпадения
+        'kmp': ('a' * 1000, 'a' * 50),  # Длинные совпадения
+        'horspool': ('x' * 1000 + 'pattern', 'pattern'),  # Символы окна не из образца
+        'sunday': ('x' * 1000 + 'pattern', 'pattern')
     }
     
     # Худший случай для каждого алгоритма
@@ -162,7 +1168,9 @@ def generate_test_cases():
         'naive': ('a' * 1000, 'a' * 50 + 'b'),  # Много частичных совпадений
         'rabin_karp': ('abc' * 100, 'abd'),  # Много коллизий хешей
         'boyer_moore': ('a' * 1000, 'b' * 50),  # Нет совпадений
-        'kmp': ('a' * 1000 + 'b', 'a' * 50 + 'b')  # Длинные префиксы
+        'kmp': ('a' * 1000 + 'b', 'a' * 50 + 'b'),  # Длинные префиксы
+        'horspool': ('a' * 1000, 'b' + 'a' * 49),  # Сдвиг на 1 после почти полного сравнения
+        'sunday': ('a' * 1000, 'a' * 49 + 'b')
     }
     
     return best_cases, worst_cases
@@ -176,7 +1184,11 @@ def run_comparison():
     algorithms = {
         'Naive': searcher.naive_search,
         'Rabin-Karp': searcher.rabin_karp_search,
+        'Rabin-Karp 64': searcher.rabin_karp64_search,
         'Boyer-Moore': searcher.boyer_moore_search,
+        'Boyer-Moore Galil': searcher.boyer_moore_galil_search,
+        'Horspool': searcher.horspool_search,
+        'Sunday': searcher.sunday_search,
         'KMP': searcher.kmp_search
     }
     
@@ -266,14 +1278,19 @@ def plot_results(results):
 def complexity_analysis():
     """Анализ временной сложности алгоритмов"""
     analysis = {
-        'Алгоритм': ['Наивный', 'Рабин-Карп', 'Бойер-Мур', 'KMP'],
-        'Лучший случай': ['O(n)', 'O(n+m)', 'O(n/m)', 'O(n)'],
-        'Худший случай': ['O(n×m)', 'O(n×m)', 'O(n×m)', 'O(n+m)'],
-        'Средний случай': ['O(n×m)', 'O(n+m)', 'O(n)', 'O(n+m)'],
-        'Память': ['O(1)', 'O(1)', 'O(m+s)', 'O(m)']
+        'Алгоритм': ['Наивный', 'Рабин-Карп', 'Рабин-Карп 64', 'Бойер-Мур', 'Бойер-Мур (Галил)',
+                     'Хорспул', 'Санди', 'KMP', 'Ахо-Корасик'],
+        'Лучший случай': ['O(n)', 'O(n+m)', 'O(n+m)', 'O(n/m)', 'O(n/m)', 'O(n/m)', 'O(n/(m+1))',
+                          'O(n)', 'O(n+M+z)'],
+        'Худший случай': ['O(n×m)', 'O(n×m)', 'O(n+m×z)', 'O(n×m)', 'O(n+m)', 'O(n×m)', 'O(n×m)',
+                          'O(n+m)', 'O(n+M×s+z)'],
+        'Средний случай': ['O(n×m)', 'O(n+m)', 'O(n+m)', 'O(n)', 'O(n/m)', 'O(n/m)', 'O(n/m)',
+                           'O(n+m)', 'O(n+M+z)'],
+        'Память': ['O(1)', 'O(1)', 'O(1)', 'O(m+s)', 'O(m+s)', 'O(s)', 'O(s)', 'O(m)', 'O(M×s)']
     }
     
     print("\n=== АНАЛИЗ СЛОЖНОСТИ ===")
+    print("(M - суммарная длина образцов, s - размер алфавита, z - число совпадений)")
     for i in range(len(analysis['Алгоритм'])):
         print(f"\n{analysis['Алгоритм'][i]}:")
         print(f"  Лучший случай: {analysis['Лучший случай'][i]}")
@@ -292,8 +1309,13 @@ def practical_recommendations():
         },
         {
             'Ситуация': 'Поиск нескольких паттернов',
-            'Рекомендация': 'Рабин-Карп',
-            'Причина': 'Эффективное хеширование нескольких образцов'
+            'Рекомендация': 'Ахо-Корасик',
+            'Причина': 'Один проход по тексту для всего набора, автомат строится один раз'
+        },
+        {
+            'Ситуация': 'Много образцов нескольких длин',
+            'Рекомендация': 'Рабин-Карп (мульти, модуль 2^61 - 1)',
+            'Причина': 'Словарь хешей на каждую длину, памяти меньше, чем у автомата'
         },
         {
             'Ситуация': 'Тексты на естественных языках',
@@ -318,6 +1340,40 @@ def practical_recommendations():
         print(f"  Алгоритм: {rec['Рекомендация']}")
         print(f"  Причина: {rec['Причина']}")
 
+# Поиск набора образцов
+def multi_pattern_demo(pattern_count=1000, text_length=200000, seed=42):
+    """Сравнение Ахо-Корасик с поиском каждого образца по отдельности"""
+    rng = random.Random(seed)
+    alphabet = 'abcdefghij'
+    text = ''.join(rng.choice(alphabet) for _ in range(text_length))
+    patterns = [''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 8)))
+                for _ in range(pattern_count)]
+    
+    start_time = time.time()
+    automaton = AhoCorasick(patterns)
+    build_time = time.time() - start_time
+    
+    start_time = time.time()
+    matches = automaton.search(text)
+    search_time = time.time() - start_time
+    
+    # Для сравнения - str.find по каждому образцу (встроенный поиск на C)
+    sample = automaton.patterns[:50]
+    start_time = time.time()
+    single = 0
+    for pattern in sample:
+        position = text.find(pattern)
+        while position >= 0:
+            single += 1
+            position = text.find(pattern, position + 1)
+    single_time = (time.time() - start_time) * len(automaton.patterns) / len(sample)
+    
+    print("\n=== ПОИСК НАБОРА ОБРАЗЦОВ ===")
+    print(f"Образцов: {len(automaton.patterns)}, длина текста: {text_length}, состояний: {len(automaton)}")
+    print(f"Ахо-Корасик: построение {build_time * 1000:.1f} мс, поиск {search_time * 1000:.1f} мс, "
+          f"совпадений {len(matches)}")
+    print(f"По одному образцу (оценка по {len(sample)}): {single_time * 1000:.1f} мс")
+
 # Запуск полного анализа
 if __name__ == "__main__":
     print("ЗАПУСК СРАВНИТЕЛЬНОГО АНАЛИЗА АЛГОРИТМОВ ПОИСКА ПОДСТРОК")
@@ -335,11 +1391,17 @@ if __name__ == "__main__":
     # Рекомендации
     practical_recommendations()
     
+    # Несколько образцов
+    multi_pattern_demo()
+    
+    # Индексы
+    index_demo()
+    
     # Итоговый вывод
     print("\n" + "=" * 60)
     print("ИТОГОВЫЕ ВЫВОДЫ:")
     print("1. Бойер-Мур показывает лучшие результаты на практике")
     print("2. KMP гарантирует линейное время в худшем случае") 
     print("3. Наивный алгоритм эффективен только для коротких строк")
-    print("4. Рабин-Карп хорош для поиска нескольких паттернов")
+    print("4. Для поиска нескольких паттернов - автомат Ахо-Корасик")
     print("5. Выбор алгоритма зависит от специфики задачи и данных")
\ No newline at end of file